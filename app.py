@@ -1,83 +1,154 @@
-from flask import Flask, render_template, request, jsonify, session, send_file
-from werkzeug.utils import secure_filename
-import pandas as pd
-from processor import initialize_gemini, process_resumes, extract_text_from_file, clean_text
+from flask import Flask, Request, Response, render_template, request, jsonify, session, send_file, stream_with_context, g
+from processor import (
+    initialize_gemini, process_resumes, rank_resume_texts, reanalyze_results, cached_resume_text, extract_text_from_file, extract_resume_text,
+    file_content_hash, parse_job_description, prerank_query, iter_upload_members, PIPELINE_CONFIG
+)
+from jobs import JobManager
+from store import ResultStore
+from talent_pool import TalentPool, PoolResume
+from exports import COLUMNAR_FORMATS, iter_csv, write_columnar
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, JOBS, REGISTRY
+from profiling import Profiler
+from uploads import (
+    save_upload, spool_upload, guess_file_type, list_archive_members, StreamlitFileWrapper, SpooledFileWrapper,
+    ARCHIVE_TYPES, SPOOL_MAX_MEMORY
+)
 import json
-import base64
 from io import BytesIO
-import matplotlib.pyplot as plt
-import numpy as np
 import os
 from datetime import datetime
 import uuid
 import tempfile
-import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class UploadLimitRequest(Request):
+    """Only resume uploads, which may carry archives, get the larger body limit"""
+    @property
+    def max_content_length(self):
+        if self.endpoint == 'upload_resumes':
+            return max(app.config['MAX_CONTENT_LENGTH'], app.config['MAX_ARCHIVE_BYTES'])
+        return super().max_content_length
 
 app = Flask(__name__)
+app.request_class = UploadLimitRequest
 app.secret_key = 'your-secret-key-here'  # Change this to a secure secret key
 app.config['UPLOAD_FOLDER'] = 'uploads'
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['MAX_RESUME_BYTES'] = 5 * 1024 * 1024  # 5MB per resume
+app.config['MAX_ARCHIVE_BYTES'] = int(os.environ.get('MAX_ARCHIVE_BYTES', str(200 * 1024 * 1024)))  # Per ZIP/tar.gz upload
+app.config['MAX_ARCHIVE_MEMBERS'] = int(os.environ.get('MAX_ARCHIVE_MEMBERS', '2000'))  # Resumes per archive
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # Whole request (MAX_ARCHIVE_BYTES for resume uploads); per-file limits apply too
+app.config['MAX_JOB_FILE_BYTES'] = 16 * 1024 * 1024  # 16MB per job description file
+app.config['ANALYSIS_WORKERS'] = int(os.environ.get('ANALYSIS_WORKERS', '2'))  # Concurrent analysis jobs
+app.config['JD_WARMUP_WORKERS'] = int(os.environ.get('JD_WARMUP_WORKERS', '1'))  # Concurrent background job description parses
+app.config['MAX_OPEN_STREAMS'] = int(os.environ.get('MAX_OPEN_STREAMS', '4'))  # Concurrent /analysis_stream connections
+app.config['RESULT_STORE_PATH'] = os.environ.get('RESULT_STORE_PATH', os.path.join('data', 'results.sqlite3'))
+app.config['RESULTS_PER_PAGE'] = 50  # Candidate selector page size
+# Keeping candidate text across sessions is opt-in
+app.config['TALENT_POOL_ENABLED'] = os.environ.get('TALENT_POOL_ENABLED', '0').lower() not in ('0', 'false', 'no')
+app.config['TALENT_POOL_PATH'] = os.environ.get('TALENT_POOL_PATH', os.path.join('data', 'talent_pool.sqlite3'))
+app.config['TALENT_POOL_TOP_K'] = int(os.environ.get('TALENT_POOL_TOP_K', '100'))  # Pool matches scored per job
+app.config['TALENT_POOL_RETENTION_DAYS'] = float(os.environ.get('TALENT_POOL_RETENTION_DAYS', '30'))  # 0 = keep forever
+app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR', os.path.join('data', 'profiles'))
+app.config['PROFILE_SAMPLE_RATE'] = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))  # Share of POST requests profiled
+app.config['PROFILE_TOKEN'] = os.environ.get('PROFILE_TOKEN', '')  # X-Profile header value; header ignored when unset
+app.config['PROFILE_MAX_CONCURRENT'] = int(os.environ.get('PROFILE_MAX_CONCURRENT', '1'))  # Profiles running at once
+app.config['PROFILE_SAMPLE_INTERVAL_MS'] = float(os.environ.get('PROFILE_SAMPLE_INTERVAL_MS', '5'))  # Stack sampling period
+app.config['PROFILE_KEEP'] = int(os.environ.get('PROFILE_KEEP', '50'))  # Profiles kept on disk
+
+# Background pool that runs /analyze batches outside the request
+job_manager = JobManager(max_workers=app.config['ANALYSIS_WORKERS'])
+
+# Job description pre-parsing gets its own threads so it never queues behind analysis jobs
+warmup_executor = ThreadPoolExecutor(max_workers=max(1, app.config['JD_WARMUP_WORKERS']), thread_name_prefix='jd-warmup')
+
+# Each open SSE stream holds a server thread; the rest stay free for other requests
+open_streams = threading.BoundedSemaphore(max(1, app.config['MAX_OPEN_STREAMS']))
+
+# Analysis results live server-side; the cookie session only carries the run id
+result_store = ResultStore(app.config['RESULT_STORE_PATH'])
+
+# Every analyzed resume is indexed here so later jobs can match it without a re-upload
+talent_pool = TalentPool(app.config['TALENT_POOL_PATH'])
+
+# Opt-in cProfile + stack sampling of requests and the jobs they queue
+profiler = Profiler(
+    app.config['PROFILE_DIR'],
+    sample_rate=app.config['PROFILE_SAMPLE_RATE'],
+    max_concurrent=app.config['PROFILE_MAX_CONCURRENT'],
+    interval=app.config['PROFILE_SAMPLE_INTERVAL_MS'] / 1000,
+    keep=app.config['PROFILE_KEEP'],
+    token=app.config['PROFILE_TOKEN']
+)
+
+# Streamed responses outlive the request, so profiling them would measure nothing useful
+UNPROFILED_ENDPOINTS = ('static', 'metrics', 'analysis_stream', 'export_csv')
 
 # Create upload directory if it doesn't exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-class StreamlitFileWrapper:
-    """Wrapper to mimic Streamlit's UploadedFile interface"""
-    def __init__(self, file_path, original_name):
-        self.name = original_name
-        self._file_path = file_path
-        self._file_handle = None
-        
-        # Set the type attribute based on file extension
-        if original_name.lower().endswith('.pdf'):
-            self.type = 'application/pdf'
-        elif original_name.lower().endswith('.docx'):
-            self.type = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        elif original_name.lower().endswith('.doc'):
-            self.type = 'application/msword'
-        else:
-            self.type = 'application/octet-stream'
-    
-    def read(self, size=-1):
-        if self._file_handle is None:
-            self._file_handle = open(self._file_path, 'rb')
-        if size == -1:
-            return self._file_handle.read()
-        else:
-            return self._file_handle.read(size)
-    
-    def seek(self, offset, whence=0):
-        if self._file_handle is None:
-            self._file_handle = open(self._file_path, 'rb')
-        return self._file_handle.seek(offset, whence)
-    
-    def tell(self):
-        if self._file_handle is None:
-            self._file_handle = open(self._file_path, 'rb')
-        return self._file_handle.tell()
-    
-    def close(self):
-        if self._file_handle:
-            self._file_handle.close()
-            self._file_handle = None
-    
-    def __enter__(self):
-        return self
-    
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
+@app.before_request
+def start_profile():
+    """Profile the request when asked to (X-Profile: <PROFILE_TOKEN>) or picked by PROFILE_SAMPLE_RATE"""
+    if request.endpoint in UNPROFILED_ENDPOINTS:
+        return
+    if not profiler.wanted(request.headers.get('X-Profile'), sampled_request=request.method == 'POST'):
+        return
+    slot = profiler.acquire()
+    if slot is None:
+        print("Skipping profile: PROFILE_MAX_CONCURRENT profiles already running")
+        return
+    g.profile_slot = slot
+    g.profile_run = profiler.start(slot, 'request')
+
+@app.after_request
+def add_profile_id(response):
+    """Tell the client which profile id its artifacts are saved under"""
+    if 'profile_slot' in g:
+        response.headers['X-Profile-Id'] = g.profile_slot.profile_id
+    return response
+
+@app.teardown_request
+def finish_profile(error=None):
+    """Save the request profile; a job queued by the request keeps the slot until it ends"""
+    run = g.pop('profile_run', None)
+    if run is not None:
+        run.stop()
+        g.pop('profile_slot').release()
+
+def profiled_job(func):
+    """Profile a background job too when the request queuing it is profiled"""
+    slot = g.get('profile_slot')
+    return profiler.wrap(func, slot, 'job') if slot else func
+
+def remove_temp_files(entries):
+    """Delete uploaded resume files that are no longer needed"""
+    for entry in entries:
+        for path in (entry['path'], entry.get('members_path')):
+            try:
+                if path and os.path.exists(path):
+                    os.remove(path)
+                    print(f"Cleaned up: {path}")
+            except Exception as e:
+                print(f"Error cleaning up {path}: {e}")
 
 def init_session():
     """Initialize session variables"""
-    if 'results' not in session:
-        session['results'] = []
-    if 'job_data' not in session:
-        session['job_data'] = {}
     if 'current_candidate' not in session:
         session['current_candidate'] = 0
     if 'active_section' not in session:
         session['active_section'] = "overview"
 
+def get_current_run():
+    """Return metadata of the run referenced by the session, or None"""
+    return result_store.get_run(session.get('run_id'))
+
+def get_page_args(default_per_page):
+    """Read page/per_page query arguments"""
+    page = max(1, request.args.get('page', 1, type=int))
+    per_page = max(1, min(500, request.args.get('per_page', default_per_page, type=int)))
+    return page, per_page
+
 def create_gauge_chart_data(score, title):
     """Create gauge chart data for frontend"""
     if score >= 75:
@@ -140,10 +211,11 @@ def index():
     init_session()
     
     # Check if we have results to show
-    if session.get('results'):
+    run = get_current_run()
+    if run and run['total']:
         return render_template('index.html', 
                              has_results=True,
-                             results=session['results'],
+                             results=result_store.list_candidates(run['run_id'], 0, app.config['RESULTS_PER_PAGE']),
                              current_candidate=session['current_candidate'],
                              active_section=session['active_section'])
     else:
@@ -159,6 +231,14 @@ def check_job_status():
         'job_length': len(job_text) if job_text else 0
     })
 
+def warm_job_description(job_text):
+    """Parse the job description ahead of /analyze so it is served from cache"""
+    try:
+        parse_job_description(job_text, initialize_gemini())
+        print(f"Job description parsed in background ({len(job_text)} characters)")
+    except Exception as e:
+        print(f"Background job description parse failed: {e}")
+
 @app.route('/upload_job_description', methods=['POST'])
 def upload_job_description():
     """Handle job description upload - FIXED VERSION"""
@@ -169,19 +249,22 @@ def upload_job_description():
         
         if job_file and job_file.filename:
             print(f"Processing job file: {job_file.filename}")
-            # Save the file temporarily
-            filename = secure_filename(job_file.filename)
-            temp_filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"temp_jd_{uuid.uuid4()}_{filename}")
-            job_file.save(temp_filepath)
+            file_wrapper = None
             
             try:
+                # Stream the upload into spooled storage, hashing it on the way in
+                spooled, content_hash, size = spool_upload(job_file, max_bytes=app.config['MAX_JOB_FILE_BYTES'])
+                print(f"Received job file: {size} bytes")
+                
                 # Create a wrapper that matches the interface your processor expects
-                file_wrapper = StreamlitFileWrapper(temp_filepath, job_file.filename)
+                file_wrapper = SpooledFileWrapper(spooled, job_file.filename, content_hash)
                 
-                # Extract text using your existing processor function
-                extracted_text = extract_text_from_file(file_wrapper)
+                # Extract text using your existing processor function; the resume
+                # text budget doesn't apply, long job descriptions are read in full
+                extracted_text = extract_text_from_file(file_wrapper, max_chars=None, max_pages=None)
                 if extracted_text and not extracted_text.startswith("Error"):
-                    job_text = clean_text(extracted_text)
+                    # Extraction already returns cleaned text
+                    job_text = extracted_text
                     print(f"Extracted {len(job_text)} characters from job file")
                 
                 # Close the file wrapper
@@ -194,16 +277,17 @@ def upload_job_description():
                 print(f"Error extracting text from job file: {e}")
                 return jsonify({'success': False, 'error': f'Error extracting text from file: {str(e)}'})
             finally:
-                # Clean up the temporary file
-                try:
-                    os.remove(temp_filepath)
-                except:
-                    pass
+                # Spooled storage is released when the wrapper closes
+                if file_wrapper:
+                    file_wrapper.close()
         
         # Store the job text in session
         if job_text.strip():
             session['job_text'] = job_text.strip()
             print(f"Job description stored in session: {len(job_text)} characters")
+            
+            # Take the Gemini parse off the /analyze critical path
+            warmup_executor.submit(warm_job_description, session['job_text'])
             return jsonify({
                 'success': True, 
                 'message': f'Job description processed successfully ({len(job_text)} characters)',
@@ -227,32 +311,142 @@ def upload_resumes():
             return jsonify({'success': False, 'error': 'No files uploaded'})
         
         valid_files = [f for f in files if f.filename]
-        session['resume_count'] = len(valid_files)
         
-        # Store files temporarily for processing
+        # Stream files to disk for processing, hashing them as they are written.
+        # Archives are stored as-is; their members are read in-stream during analysis.
         temp_files = []
-        for file in valid_files:
-            filename = secure_filename(file.filename)
-            temp_filename = f"{uuid.uuid4()}_{filename}"
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], temp_filename)
-            file.save(filepath)
-            temp_files.append(filepath)
-            print(f"Saved resume file: {filepath}")
+        resume_count = 0
+        try:
+            for file in valid_files:
+                is_archive = guess_file_type(file.filename) in ARCHIVE_TYPES
+                filepath, content_hash, size = save_upload(
+                    file,
+                    app.config['UPLOAD_FOLDER'],
+                    max_bytes=app.config['MAX_ARCHIVE_BYTES'] if is_archive else app.config['MAX_RESUME_BYTES'],
+                    prefix=f"{uuid.uuid4().hex[:8]}_"
+                )
+                temp_files.append({'path': filepath, 'name': file.filename, 'content_hash': content_hash})
+                print(f"Saved resume file: {filepath} ({size} bytes)")
+                
+                with StreamlitFileWrapper(filepath, file.filename, content_hash) as saved:
+                    file_type = saved.type
+                if file_type in ARCHIVE_TYPES:
+                    member_names = [os.path.basename(name) for name in list_archive_members(filepath)]
+                    if len(member_names) > app.config['MAX_ARCHIVE_MEMBERS']:
+                        raise ValueError(f"{file.filename} has {len(member_names)} files; the limit is {app.config['MAX_ARCHIVE_MEMBERS']}")
+                    # Kept next to the upload (too big for the session cookie) so
+                    # /analyze doesn't decompress the archive again to list it
+                    temp_files[-1]['members_path'] = filepath + '.members.json'
+                    with open(temp_files[-1]['members_path'], 'w') as f:
+                        json.dump(member_names, f)
+                    resume_count += len(member_names)
+                elif size > app.config['MAX_RESUME_BYTES']:
+                    # Named like an archive but isn't one, so the archive size limit doesn't apply
+                    raise ValueError(f"{file.filename} exceeds the {app.config['MAX_RESUME_BYTES'] // (1024 * 1024)}MB upload limit")
+                else:
+                    resume_count += 1
+        except Exception:
+            remove_temp_files(temp_files)
+            raise
+        
+        # Drop files from an earlier upload that was never analyzed
+        remove_temp_files(session.get('temp_resume_files', []))
         
         session['temp_resume_files'] = temp_files
+        session['resume_count'] = resume_count
         
-        return jsonify({'success': True, 'message': f'{len(temp_files)} files uploaded successfully'})
+        return jsonify({'success': True, 'message': f'{resume_count} resumes uploaded successfully'})
     
     except Exception as e:
         print(f"Error uploading resumes: {e}")
         return jsonify({'success': False, 'error': str(e)})
 
+def index_resumes(resume_files):
+    """Add analyzed resumes to the talent pool (text comes from the extraction cache)"""
+    if not app.config['TALENT_POOL_ENABLED']:
+        return
+    added = 0
+    try:
+        if app.config['TALENT_POOL_RETENTION_DAYS'] > 0:
+            expired = talent_pool.purge(max_age_seconds=app.config['TALENT_POOL_RETENTION_DAYS'] * 86400)
+            if expired:
+                print(f"Talent pool: removed {expired} candidates past retention")
+        for resume_file in resume_files:
+            content_hash = file_content_hash(resume_file)
+            if talent_pool.contains(content_hash):
+                continue
+            resume_text = extract_resume_text(resume_file)
+            if resume_text and talent_pool.add(content_hash, resume_file.name, resume_text):
+                added += 1
+        print(f"Talent pool: indexed {added} new resumes")
+    except Exception as e:
+        print(f"Error indexing resumes into the talent pool: {e}")
+
+def run_pool_match_job(job_text, job_data, resumes, resume_texts, refresh=False, progress_callback=None):
+    """Score talent-pool candidates for a job on a background worker"""
+    model = initialize_gemini()
+    print(f"Scoring {len(resumes)} talent pool candidates...")
+    results, job_data, batch_stats = rank_resume_texts(
+        job_text, job_data, resumes, resume_texts, model,
+        config={'refresh': refresh},
+        progress_callback=progress_callback
+    )
+    run_id = result_store.create_run(results, job_data, batch_stats)
+    return {'run_id': run_id, 'results_count': len(results)}
+
+def run_reanalysis_job(job_text, previous_job_data, previous_results, resume_texts, refresh=False, progress_callback=None):
+    """Incrementally re-score a previous run for an edited job description"""
+    model = initialize_gemini()
+    job_data = parse_job_description(job_text, model, refresh=refresh)
+    results, job_data, batch_stats, summary = reanalyze_results(
+        job_text, job_data, previous_job_data, previous_results, resume_texts, model,
+        config={'refresh': refresh},
+        progress_callback=progress_callback
+    )
+    run_id = result_store.create_run(results, job_data, {**batch_stats, 'reanalysis': summary})
+    return {'run_id': run_id, 'results_count': len(results), 'reanalysis': summary}
+
+def run_analysis_job(job_text, resume_files, temp_files, refresh=False, progress_callback=None):
+    """Run a full analysis batch on a background worker"""
+    try:
+        # Initialize Gemini
+        print("Initializing Gemini model...")
+        model = initialize_gemini()
+        
+        print(f"Processing {len(resume_files)} resume files...")
+        
+        # Process resumes with enhanced processor
+        results, job_data, batch_stats = process_resumes(
+            job_text, resume_files, model,
+            config={'refresh': refresh},
+            progress_callback=progress_callback
+        )
+        
+        print(f"Analysis complete. Results: {len(results)} candidates processed")
+        for result in results:
+            print(f"- {result['candidate_name']}: {result['overall_score']} points")
+        
+        run_id = result_store.create_run(results, job_data, batch_stats)
+        # Archive members are re-read in-stream; their text is already in the extraction cache
+        index_resumes(iter_upload_members(resume_files, PIPELINE_CONFIG['archive_member_max_bytes']))
+        return {'run_id': run_id, 'results_count': len(results)}
+    
+    finally:
+        # Close all file wrappers
+        for file_wrapper in resume_files:
+            file_wrapper.close()
+        
+        # Clean up temporary files
+        remove_temp_files(temp_files)
+
 @app.route('/analyze', methods=['POST'])
 def analyze():
-    """Process the analysis - ENHANCED VERSION"""
+    """Queue the analysis as a background job and return its id"""
     try:
         job_text = session.get('job_text')
         temp_files = session.get('temp_resume_files', [])
+        # refresh=true bypasses cached LLM analyses
+        refresh = str(request.values.get('refresh', '')).lower() in ('1', 'true', 'yes')
         
         print(f"Starting analysis with job_text length: {len(job_text) if job_text else 0}")
         print(f"Number of resume files: {len(temp_files)}")
@@ -263,88 +457,300 @@ def analyze():
         if not temp_files:
             return jsonify({'success': False, 'error': 'No resume files provided'})
         
-        # Initialize Gemini
-        print("Initializing Gemini model...")
-        model = initialize_gemini()
-        
         # Create file objects for processing
         resume_files = []
-        for filepath in temp_files:
-            if os.path.exists(filepath):
-                resume_files.append(StreamlitFileWrapper(filepath, os.path.basename(filepath)))
+        for entry in temp_files:
+            if os.path.exists(entry['path']):
+                resume_files.append(StreamlitFileWrapper(entry['path'], entry['name'], entry['content_hash']))
             else:
-                print(f"Warning: File not found: {filepath}")
+                print(f"Warning: File not found: {entry['path']}")
         
         if not resume_files:
+            session.pop('temp_resume_files', None)
             return jsonify({'success': False, 'error': 'No valid resume files found'})
         
-        print(f"Processing {len(resume_files)} resume files...")
-        
-        # Process resumes with enhanced processor
-        results, job_data = process_resumes(job_text, resume_files, model)
-        
-        # Close all file wrappers
-        for file_wrapper in resume_files:
-            file_wrapper.close()
-        
-        print(f"Analysis complete. Results: {len(results)} candidates processed")
-        for result in results:
-            print(f"- {result['candidate_name']}: {result['overall_score']} points")
-        
-        # Store results in session
-        session['results'] = results
-        session['job_data'] = job_data
-        session['current_candidate'] = 0
-        session['active_section'] = 'overview'
+        # Archives are listed member by member so progress is reported per resume
+        file_names = []
+        for resume_file in resume_files:
+            if resume_file.type in ARCHIVE_TYPES:
+                entry = next(entry for entry in temp_files if entry['path'] == resume_file.path)
+                with open(entry['members_path'], 'r') as f:
+                    file_names.extend(json.load(f))
+            else:
+                file_names.append(resume_file.name)
         
-        # Clean up temporary files
-        for filepath in temp_files:
-            try:
-                if os.path.exists(filepath):
-                    os.remove(filepath)
-                    print(f"Cleaned up: {filepath}")
-            except Exception as e:
-                print(f"Error cleaning up {filepath}: {e}")
+        # The job owns the temporary files from here on and removes them when done
+        job_id = job_manager.submit(
+            profiled_job(run_analysis_job),
+            file_names,
+            job_text, resume_files, temp_files,
+            refresh=refresh
+        )
+        print(f"Queued analysis job {job_id} for {len(file_names)} resumes")
         
         session.pop('temp_resume_files', None)
+        session['analysis_job_id'] = job_id
         
         return jsonify({
-            'success': True, 
-            'message': f'Analysis complete! Processed {len(results)} resumes',
-            'results_count': len(results)
+            'success': True,
+            'message': f'Analysis queued for {len(file_names)} resumes',
+            'job_id': job_id,
+            'status_url': f'/job_status/{job_id}',
+            'stream_url': f'/analysis_stream/{job_id}'
         })
     
     except Exception as e:
         print(f"Error during analysis: {e}")
         # Clean up temporary files on error
-        temp_files = session.get('temp_resume_files', [])
-        for filepath in temp_files:
-            try:
-                if os.path.exists(filepath):
-                    os.remove(filepath)
-            except:
-                pass
+        remove_temp_files(session.get('temp_resume_files', []))
         session.pop('temp_resume_files', None)
         
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/talent_pool')
+def talent_pool_stats():
+    """Size of the stored candidate index"""
+    try:
+        return jsonify({'success': True, 'enabled': app.config['TALENT_POOL_ENABLED'], **talent_pool.stats()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/talent_pool/purge', methods=['POST'])
+def purge_talent_pool():
+    """Delete every stored candidate from the talent pool"""
+    try:
+        removed = talent_pool.purge()
+        print(f"Talent pool purged: {removed} candidates removed")
+        return jsonify({'success': True, 'removed': removed})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/match_talent_pool', methods=['POST'])
+def match_talent_pool():
+    """Match the current job description against every stored candidate"""
+    try:
+        job_text = session.get('job_text')
+        refresh = str(request.values.get('refresh', '')).lower() in ('1', 'true', 'yes')
+        top_k = int(request.values.get('top_k', app.config['TALENT_POOL_TOP_K']))
+        
+        if not job_text:
+            return jsonify({'success': False, 'error': 'No job description provided'})
+        
+        # Usually a cache hit: the JD is parsed in the background when uploaded
+        job_data = parse_job_description(job_text, initialize_gemini(), refresh=refresh)
+        
+        # BM25 over the inverted index picks the candidates worth scoring
+        matches = talent_pool.search(prerank_query(job_text, job_data), top_k=top_k)
+        candidates = talent_pool.get_candidates(content_hash for content_hash, _ in matches)
+        resumes = [
+            PoolResume(candidates[content_hash]['file_name'], content_hash)
+            for content_hash, _ in matches if content_hash in candidates
+        ]
+        if not resumes:
+            return jsonify({'success': False, 'error': 'No stored candidates match this job description'})
+        
+        job_id = job_manager.submit(
+            profiled_job(run_pool_match_job),
+            [resume.name for resume in resumes],
+            job_text, job_data, resumes, [candidates[resume.content_hash]['text'] for resume in resumes],
+            refresh=refresh
+        )
+        print(f"Queued talent pool match {job_id} for {len(resumes)} candidates")
+        session['analysis_job_id'] = job_id
+        
+        return jsonify({
+            'success': True,
+            'message': f'Scoring {len(resumes)} matching candidates from the talent pool',
+            'job_id': job_id,
+            'status_url': f'/job_status/{job_id}',
+            'stream_url': f'/analysis_stream/{job_id}'
+        })
+    
+    except Exception as e:
+        print(f"Error matching talent pool: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/reanalyze', methods=['POST'])
+def reanalyze():
+    """Re-run the current results against the edited job description, reusing what did not change"""
+    try:
+        job_text = session.get('job_text')
+        run = get_current_run()
+        refresh = str(request.values.get('refresh', '')).lower() in ('1', 'true', 'yes')
+        
+        if not job_text:
+            return jsonify({'success': False, 'error': 'No job description provided'})
+        if not run:
+            return jsonify({'success': False, 'error': 'No previous analysis to update'})
+        
+        # Resume texts come from the text cache, so nothing is re-uploaded or re-parsed;
+        # the talent pool (when enabled) covers texts the cache has evicted
+        previous_results = list(result_store.iter_results(run['run_id']))
+        resume_texts = [
+            cached_resume_text(result.get('file_type'), result.get('content_hash'))
+            for result in previous_results
+        ]
+        missing = [i for i, text in enumerate(resume_texts) if text is None and previous_results[i].get('content_hash')]
+        if missing and app.config['TALENT_POOL_ENABLED']:
+            candidates = talent_pool.get_candidates(previous_results[i]['content_hash'] for i in missing)
+            for i in missing:
+                candidate = candidates.get(previous_results[i]['content_hash'])
+                if candidate:
+                    resume_texts[i] = candidate['text']
+        
+        job_id = job_manager.submit(
+            profiled_job(run_reanalysis_job),
+            [result['file_name'] for result in previous_results],
+            job_text, run['job_data'], previous_results, resume_texts,
+            refresh=refresh
+        )
+        print(f"Queued incremental re-analysis {job_id} for {len(previous_results)} candidates")
+        session['analysis_job_id'] = job_id
+        
+        return jsonify({
+            'success': True,
+            'message': f'Re-analysis queued for {len(previous_results)} candidates',
+            'job_id': job_id,
+            'status_url': f'/job_status/{job_id}',
+            'stream_url': f'/analysis_stream/{job_id}'
+        })
+    
+    except Exception as e:
+        print(f"Error starting re-analysis: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/job_status/<job_id>')
+def job_status(job_id):
+    """Report per-resume progress of an analysis job and load its results when ready"""
+    try:
+        status = job_manager.status(job_id)
+        if status is None:
+            return jsonify({'success': False, 'error': 'Unknown analysis job'})
+        
+        if status['status'] == 'completed':
+            job_result = job_manager.get(job_id)['result']
+            # Point the session at the stored run once the job has finished
+            if session.get('analysis_job_id') == job_id:
+                previous_run_id = session.get('run_id')
+                if previous_run_id and previous_run_id != job_result['run_id']:
+                    result_store.delete_run(previous_run_id)
+                session['run_id'] = job_result['run_id']
+                session['current_candidate'] = 0
+                session['active_section'] = 'overview'
+                session.pop('analysis_job_id', None)
+            status['run_id'] = job_result['run_id']
+            status['results_count'] = job_result['results_count']
+            if 'reanalysis' in job_result:
+                status['reanalysis'] = job_result['reanalysis']
+            status['message'] = f"Analysis complete! Processed {status['results_count']} resumes"
+        
+        return jsonify({'success': status['status'] != 'failed', **status})
+    
+    except Exception as e:
+        print(f"Error in job_status: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
+def sse_event(event, data, event_id=None):
+    """Format one Server-Sent Events message"""
+    message = f"event: {event}\n"
+    if event_id is not None:
+        message += f"id: {event_id}\n"
+    return message + f"data: {json.dumps(data)}\n\n"
+
+@app.route('/analysis_stream/<job_id>')
+def analysis_stream(job_id):
+    """Stream each candidate's result as it finishes, then the final ranking (SSE)"""
+    status = job_manager.status(job_id)
+    if status is None:
+        return jsonify({'success': False, 'error': 'Unknown analysis job'}), 404
+    
+    if not open_streams.acquire(blocking=False):
+        return jsonify({
+            'success': False,
+            'error': 'Too many open streams, poll the status URL instead',
+            'status_url': f'/job_status/{job_id}'
+        }), 503
+    
+    # EventSource resends the last id it saw when it reconnects
+    try:
+        start_cursor = max(0, int(request.headers.get('Last-Event-ID', 0)))
+    except ValueError:
+        start_cursor = 0
+    total = status['total']
+    
+    def generate():
+        cursor = start_cursor
+        yield sse_event('start', {'job_id': job_id, 'total': total})
+        
+        while True:
+            update = job_manager.wait_events(job_id, cursor)
+            if update is None:
+                yield sse_event('error', {'error': 'Unknown analysis job'})
+                return
+            events, cursor, finished = update
+            
+            first = cursor - len(events)
+            for offset, event in enumerate(events):
+                completed = first + offset + 1
+                yield sse_event('result', {
+                    'index': event['index'],
+                    'status': event['status'],
+                    'completed': completed,
+                    'total': total,
+                    'result': event['result']
+                }, event_id=completed)
+            
+            if finished:
+                break
+            if not events:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+        
+        final_status = job_manager.status(job_id)
+        if final_status is None or final_status['status'] != 'completed':
+            yield sse_event('error', {'error': (final_status or {}).get('error') or 'Analysis failed'})
+            return
+        
+        job_result = job_manager.get(job_id)['result']
+        run_id = job_result['run_id']
+        # Ranked summary; /job_status still links the run to the session
+        yield sse_event('summary', {
+            'run_id': run_id,
+            'results_count': job_result['results_count'],
+            'summary': result_store.score_summary(run_id),
+            'ranking': result_store.list_candidates(run_id, 0, job_result['results_count'])
+        })
+    
+    response = Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # Runs when the stream ends or the client disconnects
+    response.call_on_close(open_streams.release)
+    return response
+
 @app.route('/get_results')
 def get_results():
     """Get current results data"""
     try:
-        results = session.get('results', [])
+        run = get_current_run()
         current_candidate = session.get('current_candidate', 0)
         
-        if not results or current_candidate >= len(results):
+        if not run or current_candidate >= run['total']:
             return jsonify({'success': False, 'error': 'No results available'})
         
-        current_result = results[current_candidate]
+        current_result = result_store.get_result(run['run_id'], current_candidate)
         metrics = calculate_metrics(current_result)
         
-        # Prepare candidate names for selector
+        # Prepare candidate names for selector, one page at a time;
+        # defaults to the page holding the current candidate
+        page, per_page = get_page_args(app.config['RESULTS_PER_PAGE'])
+        if 'page' not in request.args:
+            page = current_candidate // per_page + 1
         candidate_names = [
             f"{r['candidate_name']} ({r['overall_score']}/100)" 
-            for r in results
+            for r in result_store.list_candidates(run['run_id'], (page - 1) * per_page, per_page)
         ]
         
         # Create gauge data
@@ -375,7 +781,10 @@ def get_results():
             'metrics': metrics,
             'candidate_names': candidate_names,
             'current_candidate': current_candidate,
-            'total_candidates': len(results),
+            'total_candidates': run['total'],
+            'page': page,
+            'per_page': per_page,
+            'total_pages': (run['total'] + per_page - 1) // per_page,
             'overall_gauge': overall_gauge,
             'confidence_gauge': confidence_gauge,
             'verdict_class': verdict_class,
@@ -392,8 +801,8 @@ def get_results():
 @app.route('/set_candidate/<int:candidate_index>')
 def set_candidate(candidate_index):
     """Set current candidate"""
-    results = session.get('results', [])
-    if 0 <= candidate_index < len(results):
+    run = get_current_run()
+    if run and 0 <= candidate_index < run['total']:
         session['current_candidate'] = candidate_index
         return jsonify({'success': True})
     return jsonify({'success': False, 'error': 'Invalid candidate index'})
@@ -411,13 +820,13 @@ def set_section(section_name):
 def get_section_data(section_name):
     """Get data for specific section"""
     try:
-        results = session.get('results', [])
+        run = get_current_run()
         current_candidate = session.get('current_candidate', 0)
         
-        if not results or current_candidate >= len(results):
+        if not run or current_candidate >= run['total']:
             return jsonify({'success': False, 'error': 'No results available'})
         
-        current_result = results[current_candidate]
+        current_result = result_store.get_result(run['run_id'], current_candidate)
         metrics = calculate_metrics(current_result)
         
         if section_name == 'skills':
@@ -516,13 +925,13 @@ def get_section_data(section_name):
 def download_report():
     """Generate and download report"""
     try:
-        results = session.get('results', [])
+        run = get_current_run()
         current_candidate = session.get('current_candidate', 0)
         
-        if not results or current_candidate >= len(results):
+        if not run or current_candidate >= run['total']:
             return jsonify({'success': False, 'error': 'No results available'})
         
-        current_result = results[current_candidate]
+        current_result = result_store.get_result(run['run_id'], current_candidate)
         
         # Enhanced report content
         report_content = f"""AI RESUME MATCHER PRO - DETAILED ANALYSIS REPORT
@@ -588,64 +997,69 @@ Analysis Engine: Gemini Pro with Enhanced Scoring Algorithm
 
 @app.route('/export_csv')
 def export_csv():
-    """Export all results to CSV - ENHANCED VERSION"""
+    """Stream all results as CSV, rows read from the store in batches"""
     try:
-        results = session.get('results', [])
+        run = get_current_run()
         
-        if not results:
+        if not run or not run['total']:
             return jsonify({'success': False, 'error': 'No results available'})
         
-        export_data = []
-        for result in results:
-            export_data.append({
-                'Candidate Name': result['candidate_name'],
-                'Overall Score': result['overall_score'],
-                'AI Verdict': result['verdict'],
-                'Technical Skills Score': result.get('technical_skills_score', 'N/A'),
-                'Experience Score': result.get('experience_score', 'N/A'),
-                'Education Score': result.get('education_score', 'N/A'),
-                'Profile Quality Score': result.get('profile_quality_score', 'N/A'),
-                'Years of Experience': result.get('years_of_experience', 'N/A'),
-                'Experience Match': result.get('experience_match', 'N/A'),
-                'Education Match': result.get('education_match', 'N/A'),
-                'Matched Skills Count': len(result.get('matched_skills', [])),
-                'Missing Skills Count': len(result.get('missing_skills', [])),
-                'Matched Skills': ', '.join(result.get('matched_skills', [])) if result.get('matched_skills') else '',
-                'Missing Skills': ', '.join(result.get('missing_skills', [])) if result.get('missing_skills') else '',
-                'Key Achievements': ' | '.join(result.get('key_achievements', [])) if result.get('key_achievements') else '',
-                'Strengths': ' | '.join(result.get('strengths', [])) if result.get('strengths') else '',
-                'Recommendations': ' | '.join(result.get('recommendations', [])) if result.get('recommendations') else ''
-            })
+        # Rows are written as they are read, so the first bytes go out immediately
+        return Response(
+            stream_with_context(iter_csv(result_store.iter_results(run['run_id']))),
+            mimetype='text/csv',
+            headers={'Content-Disposition': 'attachment; filename=resume_analysis_results.csv'}
+        )
+    
+    except Exception as e:
+        print(f"Error exporting CSV: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/export_columnar')
+def export_columnar():
+    """Export all results as Parquet (default) or Arrow IPC for bulk analytics"""
+    try:
+        run = get_current_run()
+        file_format = request.args.get('format', 'parquet').lower()
         
-        df = pd.DataFrame(export_data)
+        if not run or not run['total']:
+            return jsonify({'success': False, 'error': 'No results available'})
+        if file_format not in COLUMNAR_FORMATS:
+            return jsonify({'success': False, 'error': f"Unsupported format: {file_format} (use parquet or arrow)"})
         
-        # Create CSV in memory
-        temp_file = BytesIO()
-        df.to_csv(temp_file, index=False)
+        # Columnar files end with a footer, so build the file first (spilling to disk when large)
+        temp_file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+        write_columnar(result_store.iter_results(run['run_id']), temp_file, file_format)
         temp_file.seek(0)
         
+        extension, mimetype = COLUMNAR_FORMATS[file_format]
         return send_file(
             temp_file,
             as_attachment=True,
-            download_name="resume_analysis_results.csv",
-            mimetype='text/csv'
+            download_name=f"resume_analysis_results.{extension}",
+            mimetype=mimetype
         )
     
     except Exception as e:
-        print(f"Error exporting CSV: {e}")
+        print(f"Error exporting {request.args.get('format', 'parquet')}: {e}")
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/metrics')
+def metrics():
+    """Pipeline stage latencies, LLM outcomes and volumes in Prometheus text format"""
+    for status, count in job_manager.status_counts().items():
+        JOBS.set(count, status=status)
+    return Response(REGISTRY.render(), content_type=METRICS_CONTENT_TYPE)
+
 @app.route('/reset')
 def reset():
     """Reset the application state"""
     # Clean up any temporary files before clearing session
-    temp_files = session.get('temp_resume_files', [])
-    for filepath in temp_files:
-        try:
-            if os.path.exists(filepath):
-                os.remove(filepath)
-        except:
-            pass
+    remove_temp_files(session.get('temp_resume_files', []))
+    
+    if session.get('run_id'):
+        # Talent pool entries may come from other sessions too; retention and /talent_pool/purge remove them
+        result_store.delete_run(session['run_id'])
     
     session.clear()
     return jsonify({'success': True, 'message': 'Application reset successfully'})
@@ -654,24 +1068,19 @@ def reset():
 def batch_analysis():
     """Get batch analysis data for multiple candidates"""
     try:
-        results = session.get('results', [])
+        run = get_current_run()
         
-        if len(results) <= 1:
+        if not run or run['total'] <= 1:
             return jsonify({'success': False, 'error': 'Need multiple candidates for batch analysis'})
         
-        scores = [result['overall_score'] for result in results]
-        avg_score = np.mean(scores)
-        max_score = max(scores)
-        min_score = min(scores)
-        excellent_count = len([s for s in scores if s >= 75])
-        good_count = len([s for s in scores if 50 <= s < 75])
-        poor_count = len([s for s in scores if s < 50])
+        summary = result_store.score_summary(run['run_id'])
         
-        # Top candidates
-        sorted_results = sorted(results, key=lambda x: x['overall_score'], reverse=True)
+        # Ranked candidates, paged (top 5 by default)
+        page, per_page = get_page_args(5)
+        first_rank = (page - 1) * per_page + 1
         top_candidates = []
         
-        for i, result in enumerate(sorted_results[:5], 1):  # Show top 5 instead of top 3
+        for i, result in enumerate(result_store.list_candidates(run['run_id'], first_rank - 1, per_page), first_rank):
             if i == 1:
                 rank_color = "#FFD700"
                 rank_icon = "🥇"
@@ -695,14 +1104,18 @@ def batch_analysis():
             })
         
         batch_data = {
-            'avg_score': round(avg_score, 1),
-            'max_score': max_score,
-            'min_score': min_score,
-            'excellent_count': excellent_count,
-            'good_count': good_count,
-            'poor_count': poor_count,
-            'total_candidates': len(results),
-            'top_candidates': top_candidates
+            'avg_score': round(summary['avg_score'], 1),
+            'max_score': summary['max_score'],
+            'min_score': summary['min_score'],
+            'excellent_count': summary['excellent_count'],
+            'good_count': summary['good_count'],
+            'poor_count': summary['poor_count'],
+            'total_candidates': summary['total_candidates'],
+            'top_candidates': top_candidates,
+            'skill_statistics': run['stats'],
+            'page': page,
+            'per_page': per_page,
+            'total_pages': (summary['total_candidates'] + per_page - 1) // per_page
         }
         
         return jsonify({'success': True, 'data': batch_data})
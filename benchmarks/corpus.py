@@ -0,0 +1,136 @@
+"""Synthetic resume corpus for benchmarks.
+
+Writes PDF and DOCX resumes of varying length with a deterministic seed, so
+runs are comparable across machines and commits. PDFs are written by hand
+(no extra dependency); DOCX files use python-docx.
+
+    python benchmarks/corpus.py /tmp/corpus --count 200 --seed 7
+"""
+import argparse
+import io
+import os
+import random
+
+FIRST_NAMES = ['Asha', 'Ben', 'Chen', 'Dana', 'Eli', 'Farah', 'Gabe', 'Hana', 'Ivan', 'Jo', 'Kofi', 'Lena', 'Mateo', 'Nia', 'Omar', 'Priya']
+LAST_NAMES = ['Patel', 'Nguyen', 'Smith', 'Okafor', 'Garcia', 'Kim', 'Rossi', 'Haddad', 'Silva', 'Novak', 'Ito', 'Mensah']
+SKILLS = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'React', 'Node.js', 'SQL', 'PostgreSQL', 'MongoDB', 'Docker',
+    'Kubernetes', 'AWS', 'GCP', 'Azure', 'Terraform', 'Go', 'C++', 'Machine Learning', 'TensorFlow', 'Django',
+    'Flask', 'Spark', 'Kafka', 'Redis', 'GraphQL', 'CI/CD', 'Linux', 'Git', 'REST APIs', 'Microservices'
+]
+VERBS = ['Developed', 'Designed', 'Implemented', 'Built', 'Led', 'Optimized', 'Migrated', 'Automated', 'Created', 'Maintained']
+OBJECTS = [
+    'a payments service handling 2M requests a day', 'the data ingestion pipeline', 'an internal analytics dashboard',
+    'CI/CD workflows for 40 repositories', 'a recommendation model', 'the customer onboarding API',
+    'monitoring and alerting for production clusters', 'a search index over product catalogues',
+    'batch ETL jobs on a shared cluster', 'the mobile backend', 'feature flags and rollout tooling'
+]
+DEGREES = ["Bachelor's degree in Computer Science", "Master's degree in Data Science", 'B.Tech in Information Technology', 'PhD in Physics', 'Diploma in Software Engineering']
+
+# Job entries per resume for each size class
+SIZES = {'small': (1, 2), 'medium': (3, 5), 'large': (8, 14)}
+
+JOB_DESCRIPTION = (
+    "Senior Backend Engineer. We are looking for an engineer with 5+ years of experience building "
+    "distributed systems in Python and Go. Must have: Python, SQL, Docker, Kubernetes, AWS, REST APIs. "
+    "Nice to have: Kafka, Terraform, Machine Learning. Bachelor's degree in Computer Science or equivalent."
+)
+
+
+def resume_lines(rng, size):
+    """Plain-text lines of one synthetic resume"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    years = rng.randint(0, 15)
+    skills = rng.sample(SKILLS, rng.randint(4, 12))
+    lines = [
+        name,
+        f"{name.split()[0].lower()}@example.com | +1 555 {rng.randint(1000, 9999)}",
+        "SUMMARY",
+        f"Software engineer with {years} years of experience across {', '.join(skills[:3])}.",
+        "SKILLS",
+        ', '.join(skills),
+        "EXPERIENCE",
+    ]
+    low, high = SIZES[size]
+    for job in range(rng.randint(low, high)):
+        lines.append(f"Engineer, Company {rng.randint(1, 500)} ({2024 - job * 2 - 2} - {2024 - job * 2})")
+        for _ in range(rng.randint(3, 6)):
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)}.")
+    lines += ["EDUCATION", rng.choice(DEGREES)]
+    return lines
+
+
+def _pdf_escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_pdf(lines, lines_per_page=48):
+    """Minimal multi-page PDF with one Helvetica text block per page"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    font_id = 3 + 2 * len(pages)
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(' '.join(f"{3 + 2 * i} 0 R" for i in range(len(pages))), len(pages)),
+    ]
+    for i, page_lines in enumerate(pages):
+        content = "BT /F1 10 Tf 50 780 Td 14 TL " + " ".join(f"({_pdf_escape(line)}) '" for line in page_lines) + " ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out.encode('latin-1')))
+        out += f"{number} 0 obj\n{body}\nendobj\n"
+    xref = len(out.encode('latin-1'))
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n" + "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode('latin-1', errors='replace')
+
+
+def make_docx(lines):
+    from docx import Document
+
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def generate_corpus(directory, count, seed=0, pdf_share=0.5, size_weights=(0.5, 0.35, 0.15)):
+    """Write count resumes into directory and return their paths"""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for index in range(count):
+        size = rng.choices(list(SIZES), weights=size_weights)[0]
+        lines = resume_lines(rng, size)
+        if rng.random() < pdf_share:
+            path, data = os.path.join(directory, f"resume_{index:05d}_{size}.pdf"), make_pdf(lines)
+        else:
+            path, data = os.path.join(directory, f"resume_{index:05d}_{size}.docx"), make_docx(lines)
+        with open(path, 'wb') as f:
+            f.write(data)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('directory')
+    parser.add_argument('--count', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--pdf-share', type=float, default=0.5, help='fraction of resumes written as PDF')
+    args = parser.parse_args()
+    paths = generate_corpus(args.directory, args.count, args.seed, args.pdf_share)
+    print(f"Wrote {len(paths)} resumes to {args.directory}")
+
+
+if __name__ == '__main__':
+    main()
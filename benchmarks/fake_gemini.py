@@ -0,0 +1,85 @@
+"""Local stand-in for the Gemini model used by benchmarks.
+
+FakeGeminiModel.generate_content sleeps for a configurable latency and
+answers job-description, single-resume and batched prompts with
+well-formed JSON, so the whole pipeline runs without API quota. A share of
+calls can fail, either with a retryable 503 or with malformed JSON that
+exercises the parsing fallbacks.
+"""
+import json
+import random
+import re
+import threading
+import time
+
+BATCH_CANDIDATE = re.compile(r'CANDIDATE (\d+) RESUME')
+
+
+class FakeServiceUnavailable(Exception):
+    """Mimics google.api_core's 503, which gemini_client retries"""
+    code = 503
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGeminiModel:
+    def __init__(self, latency=0.3, jitter=0.1, error_rate=0.0, malformed_rate=0.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self):
+        with self._lock:
+            self.calls += 1
+            return (
+                max(0.0, self._rng.gauss(self.latency, self.jitter)) if self.jitter else self.latency,
+                self._rng.random(),
+                self._rng.randint(0, 1_000_000)
+            )
+
+    def generate_content(self, prompt):
+        delay, roll, seed = self._draw()
+        time.sleep(delay)
+        if roll < self.error_rate:
+            raise FakeServiceUnavailable("503 The model is overloaded")
+        if roll < self.error_rate + self.malformed_rate:
+            return FakeResponse('{"technical_skills_score": 30, "strengths": [')
+
+        rng = random.Random(seed)
+        if 'Analyze this job description' in prompt:
+            return FakeResponse(json.dumps({
+                'job_title': 'Senior Backend Engineer',
+                'must_have_skills': ['Python', 'SQL', 'Docker', 'Kubernetes', 'AWS', 'REST APIs'],
+                'good_to_have_skills': ['Kafka', 'Terraform', 'Machine Learning'],
+                'experience_required': '5+ years',
+                'education_required': "Bachelor's degree in Computer Science"
+            }))
+
+        candidates = BATCH_CANDIDATE.findall(prompt)
+        if candidates:
+            return FakeResponse(json.dumps([
+                {'candidate_index': int(index), **self._analysis(rng)} for index in candidates
+            ]))
+        return FakeResponse('```json\n' + json.dumps(self._analysis(rng)) + '\n```')
+
+    @staticmethod
+    def _analysis(rng):
+        return {
+            'technical_skills_score': rng.randint(10, 40),
+            'experience_score': rng.randint(5, 25),
+            'education_score': rng.randint(5, 15),
+            'profile_quality_score': rng.randint(5, 20),
+            'experience_match': rng.choice(['Excellent Match', 'Good Match', 'Partial Match', 'Poor Match']),
+            'education_match': rng.choice(['Excellent Match', 'Good Match', 'Partial Match']),
+            'strengths': ['Relevant stack', 'Production experience', 'Clear impact'],
+            'recommendations': ['Quantify results', 'Add certifications'],
+            'key_achievements': ['Scaled a service 10x'],
+            'years_of_experience': rng.randint(0, 15)
+        }
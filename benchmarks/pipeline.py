@@ -0,0 +1,209 @@
+"""Throughput and per-stage latency of process_resumes, without API quota.
+
+Generates a synthetic corpus (or uses --corpus), swaps Gemini for the local
+FakeGeminiModel and runs process_resumes over a grid of batch sizes and
+concurrency levels. For each run it reports resumes/sec and p50/p95 per call
+of each stage:
+
+    extraction      PDF/DOCX parsing (extract_document, includes cleaning)
+    extraction_pool whole extract_texts_parallel calls with --extract-workers;
+                    parsing then runs in child processes, which the
+                    per-document stages above cannot see
+    cleaning        clean_text
+    skill_matching  batch skill matrix (calculate_batch_skill_scores)
+    llm             model.generate_content (job description and resumes)
+    parsing         JSON parsing of model replies (parse_model_json)
+
+Caches live in a temporary CACHE_DIR and are cleared before every run, so
+each run is cold unless --warm is given.
+
+    python benchmarks/pipeline.py --batch-sizes 20,100 --concurrency 1,4,8 --latency 0.3
+"""
+import argparse
+import functools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from corpus import JOB_DESCRIPTION, generate_corpus
+from fake_gemini import FakeGeminiModel
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+STAGES = ['extraction', 'extraction_pool', 'cleaning', 'skill_matching', 'llm', 'parsing']
+
+
+def percentile(values, q):
+    """Linear-interpolated percentile of a non-empty list (q in 0-100)"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class StageTimer:
+    """Collects per-call durations by stage; list.append is atomic, so threads can share it"""
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def wrap(self, stage, func):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.samples[stage].append(time.perf_counter() - start)
+        return timed
+
+    def summary(self):
+        return {
+            stage: {
+                'calls': len(self.samples[stage]),
+                'p50_ms': round(percentile(self.samples[stage], 50) * 1000, 2),
+                'p95_ms': round(percentile(self.samples[stage], 95) * 1000, 2),
+                'total_s': round(sum(self.samples[stage]), 3)
+            }
+            for stage in STAGES if self.samples[stage]
+        }
+
+
+def run_once(processor, model, paths, job_text, config, warm):
+    from uploads import StreamlitFileWrapper
+
+    if not warm:
+        processor.text_cache.clear()
+        processor.job_cache.clear()
+        processor.analysis_cache.clear()
+
+    timer = StageTimer()
+    patched = {
+        'extract_document': 'extraction',
+        'extract_texts_parallel': 'extraction_pool',
+        'clean_text': 'cleaning',
+        'calculate_batch_skill_scores': 'skill_matching',
+        'parse_model_json': 'parsing',
+    }
+    originals = {name: getattr(processor, name) for name in patched}
+    original_generate = model.generate_content
+    for name, stage in patched.items():
+        setattr(processor, name, timer.wrap(stage, originals[name]))
+    model.generate_content = timer.wrap('llm', original_generate)
+
+    resume_files = [StreamlitFileWrapper(path, os.path.basename(path)) for path in paths]
+    try:
+        start = time.perf_counter()
+        results, _, _ = processor.process_resumes(job_text, resume_files, model, config=config)
+        elapsed = time.perf_counter() - start
+    finally:
+        for name, original in originals.items():
+            setattr(processor, name, original)
+        model.generate_content = original_generate
+        for resume_file in resume_files:
+            resume_file.close()
+
+    return {
+        'resumes': len(paths),
+        'elapsed_s': round(elapsed, 3),
+        'resumes_per_s': round(len(paths) / elapsed, 2) if elapsed else None,
+        'tier2': sum(1 for result in results if result.get('scoring_tier') == 2),
+        'stages': timer.summary()
+    }
+
+
+def print_run(run):
+    print(
+        f"\nbatch={run['resumes']:<5} workers={run['config']['max_workers']:<3} "
+        f"llm_batch={run['config']['llm_batch_size']:<3} extract_workers={run['config']['extract_workers']:<3}"
+        f"-> {run['resumes_per_s']} resumes/s ({run['elapsed_s']}s, {run['tier2']} via LLM)"
+    )
+    print(f"  {'stage':<16}{'calls':>7}{'p50 ms':>10}{'p95 ms':>10}{'total s':>10}")
+    for stage, stats in run['stages'].items():
+        print(f"  {stage:<16}{stats['calls']:>7}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['total_s']:>10}")
+
+
+def int_list(value):
+    return [int(part) for part in value.split(',') if part]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help='directory of resumes to use instead of a generated corpus')
+    parser.add_argument('--batch-sizes', type=int_list, default=[20, 100])
+    parser.add_argument('--concurrency', type=int_list, default=[1, 4, 8], help='MAX_CONCURRENT_ANALYSES values')
+    parser.add_argument('--llm-batch-sizes', type=int_list, default=[1], help='resumes per Gemini prompt')
+    parser.add_argument('--extract-workers', type=int, default=0, help='process pool size for parsing')
+    parser.add_argument('--shortlist', type=int, help='PRERANK_TOP_K override (0 = send every resume to the LLM)')
+    parser.add_argument('--latency', type=float, default=0.3, help='mean fake Gemini latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.1, help='standard deviation of the latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of calls failing with a 503')
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help='share of calls returning broken JSON')
+    parser.add_argument('--through-client', action='store_true', help='route calls through the rate-limited client (retries, GEMINI_RPM)')
+    parser.add_argument('--warm', action='store_true', help='keep caches between runs')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='also write all runs to this JSON file')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='resume-bench-')
+    # Must be set before processor is imported so the benchmark never touches real caches
+    os.environ['CACHE_DIR'] = os.path.join(workdir, 'cache')
+
+    import processor
+
+    # processor loads these lazily; import them now so the first run isn't charged for it
+    import numpy, PyPDF2, docx  # noqa: F401
+
+    try:
+        run_grid(args, workdir, processor)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_grid(args, workdir, processor):
+    """Run every batch size x concurrency x LLM batch size combination and report"""
+    if args.corpus:
+        paths = sorted(
+            os.path.join(args.corpus, name) for name in os.listdir(args.corpus)
+            if name.lower().endswith(('.pdf', '.docx'))
+        )
+    else:
+        paths = generate_corpus(os.path.join(workdir, 'corpus'), max(args.batch_sizes), seed=args.seed)
+    print(f"Corpus: {len(paths)} resumes, caches in {os.environ['CACHE_DIR']}")
+
+    runs = []
+    for batch_size in args.batch_sizes:
+        for workers in args.concurrency:
+            for llm_batch_size in args.llm_batch_sizes:
+                model = FakeGeminiModel(args.latency, args.jitter, args.error_rate, args.malformed_rate, seed=args.seed)
+                if args.through_client:
+                    from gemini_client import RateLimitedModel, _limiter
+                    model = RateLimitedModel(model, _limiter)
+                config = {
+                    'max_workers': workers,
+                    'llm_batch_size': llm_batch_size,
+                    'extract_workers': args.extract_workers
+                }
+                if args.shortlist is not None:
+                    config['shortlist_size'] = args.shortlist
+                run = run_once(processor, model, paths[:batch_size], JOB_DESCRIPTION, config, args.warm)
+                run['config'] = {**processor.PIPELINE_CONFIG, **config}
+                runs.append(run)
+
+    # process_resumes logs every resume; the report goes after all of it
+    for run in runs:
+        print_run(run)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(runs, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
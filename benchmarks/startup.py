@@ -0,0 +1,91 @@
+"""Measure how long a fresh interpreter takes to import the web app.
+
+Each run imports app in a new process, the way a gunicorn worker does, and
+reports the median wall time plus the slowest imports from -X importtime.
+Exits non-zero if a heavy dependency gets imported eagerly again, or when
+--max-ms is given and the median is over it.
+
+    python benchmarks/startup.py --runs 5 --max-ms 1500
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must only load on first use, never while importing the app
+LAZY_MODULES = ['google.generativeai', 'PyPDF2', 'docx', 'numpy', 'pyarrow', 'pandas', 'matplotlib']
+
+CHECK_SCRIPT = (
+    "import sys, app; "
+    "print(','.join(m for m in {modules!r} if m in sys.modules))"
+)
+
+
+def time_import(env):
+    """Wall time in ms for one cold `import app`, and the eagerly loaded heavy modules"""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-c', CHECK_SCRIPT.format(modules=LAZY_MODULES)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    loaded = [m for m in completed.stdout.strip().split(',') if m]
+    return elapsed, loaded
+
+
+def slowest_imports(env, limit):
+    """Top modules by cumulative import time (ms) from -X importtime"""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = [part.strip() for part in line[len('import time:'):].split('|')]
+        # Only top-level imports, so parents don't repeat their children
+        if not name.startswith(' '):
+            rows.append((int(cumulative) / 1000, name))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='cold imports to time')
+    parser.add_argument('--top', type=int, default=10, help='slowest imports to list')
+    parser.add_argument('--max-ms', type=float, help='fail if the median import time is above this')
+    args = parser.parse_args()
+
+    # Skip writing .pyc files so every run measures the same thing
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+
+    timings = []
+    eager = set()
+    for _ in range(args.runs):
+        elapsed, loaded = time_import(env)
+        timings.append(elapsed)
+        eager.update(loaded)
+
+    median = statistics.median(timings)
+    print(f"import app: median {median:.0f} ms, min {min(timings):.0f} ms, max {max(timings):.0f} ms over {args.runs} runs")
+    print("\nSlowest imports (cumulative ms):")
+    for cumulative, name in slowest_imports(env, args.top):
+        print(f"  {cumulative:8.1f}  {name}")
+
+    failed = False
+    if eager:
+        print(f"\nFAIL: imported at startup: {', '.join(sorted(eager))}")
+        failed = True
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"\nFAIL: median {median:.0f} ms is over the {args.max_ms:.0f} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""Bulk resume matching from the command line.
+
+Scores every resume under a directory against one job description and
+appends one JSON line per candidate to the output file as soon as it is
+scored. The output doubles as the checkpoint: re-running the same command
+after a crash skips every resume already written and carries on.
+
+Resumes are processed --chunk-size at a time, and pre-ranking works within
+each chunk: with PRERANK_TOP_K set, the Gemini shortlist is the top K of
+every chunk, not of the whole directory.
+
+    python cli.py resumes/ job.txt -o results.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+
+from uploads import ARCHIVE_TYPES, StreamlitFileWrapper, guess_file_type
+
+
+def find_resumes(directory):
+    """Relative paths of PDF/DOCX files under directory, in a stable order"""
+    found = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            # Archives are skipped: the checkpoint tracks one output line per file
+            if guess_file_type(name) not in ARCHIVE_TYPES + ('application/octet-stream',):
+                found.append(os.path.relpath(os.path.join(root, name), directory))
+    return found
+
+
+def read_job_text(path):
+    """Job description text from a .txt, .pdf or .docx file"""
+    from processor import extract_text_from_file
+
+    if guess_file_type(path) == 'application/octet-stream':
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    with StreamlitFileWrapper(path, os.path.basename(path)) as job_file:
+        # The whole job description, not just the resume extraction budget
+        text = extract_text_from_file(job_file, max_chars=None, max_pages=None)
+    if text.startswith(("Error", "Unsupported file format")):
+        raise SystemExit(f"Could not read {path}: {text}")
+    # Extraction already returns cleaned text
+    return text
+
+
+def load_checkpoint(output_path):
+    """Relative paths already in the output; drops a partly written last line"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    with open(output_path, 'rb+') as f:
+        valid_bytes = 0
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                done.add(json.loads(line)['file_path'])
+            except (ValueError, KeyError):
+                break
+            valid_bytes += len(line)
+        # Anything after the last complete record was cut off by a crash
+        f.truncate(valid_bytes)
+    return done
+
+
+def check_state(state_path, job_fingerprint, restart):
+    """Refuse to mix results for different job descriptions in one output file"""
+    if os.path.exists(state_path) and not restart:
+        with open(state_path, 'r') as f:
+            state = json.load(f)
+        if state.get('job_fingerprint') != job_fingerprint:
+            raise SystemExit(
+                f"{state_path} was written for a different job description; "
+                "use --restart to start over or choose another --output"
+            )
+
+
+def save_state(state_path, state):
+    temp_path = state_path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(temp_path, state_path)
+
+
+def match(args):
+    from processor import PIPELINE_CONFIG, initialize_gemini, job_text_fingerprint, process_resumes
+
+    job_text = read_job_text(args.job_file)
+    if not job_text.strip():
+        raise SystemExit(f"No text found in {args.job_file}")
+
+    output_path = args.output
+    state_path = output_path + '.state.json'
+    job_fingerprint = job_text_fingerprint(job_text)
+    check_state(state_path, job_fingerprint, args.restart)
+    if args.restart and os.path.exists(output_path):
+        os.remove(output_path)
+
+    resumes = find_resumes(args.resume_dir)
+    done = load_checkpoint(output_path)
+    pending = [path for path in resumes if path not in done]
+    print(f"{len(resumes)} resumes found, {len(done)} already scored, {len(pending)} to go")
+    if not pending:
+        return 0
+    if PIPELINE_CONFIG['shortlist_size'] and len(pending) > args.chunk_size:
+        print(f"Note: the PRERANK_TOP_K={PIPELINE_CONFIG['shortlist_size']} shortlist applies per chunk of {args.chunk_size} resumes")
+
+    config = {'refresh': args.refresh}
+    if args.workers:
+        config['max_workers'] = args.workers
+    if args.extract_workers:
+        config['extract_workers'] = args.extract_workers
+
+    model = initialize_gemini()
+    state = {
+        'job_file': os.path.abspath(args.job_file),
+        'job_fingerprint': job_fingerprint,
+        'resume_dir': os.path.abspath(args.resume_dir),
+        'total': len(resumes),
+        'config': {**PIPELINE_CONFIG, **config}
+    }
+    write_lock = threading.Lock()
+    written = len(done)
+    # Written up front so a crash inside the first chunk still pins the job description
+    save_state(state_path, {**state, 'completed': written})
+
+    with open(output_path, 'a', encoding='utf-8') as output:
+        # Chunks bound memory and how much work a crash can lose; pre-ranking
+        # and the LLM shortlist apply within each chunk (see module docstring)
+        for start in range(0, len(pending), args.chunk_size):
+            chunk = []
+            resume_files = []
+            for path in pending[start:start + args.chunk_size]:
+                resume_file = StreamlitFileWrapper(os.path.join(args.resume_dir, path), os.path.basename(path))
+                if resume_file.type in ARCHIVE_TYPES:
+                    # An archive under a document name would expand into many results
+                    resume_file.close()
+                    output.write(json.dumps({'file_path': path, 'status': 'failed', 'error': 'Archive files are not supported here'}) + '\n')
+                    written += 1
+                    continue
+                chunk.append(path)
+                resume_files.append(resume_file)
+            if not resume_files:
+                continue
+
+            def progress_callback(index, status, result=None):
+                nonlocal written
+                if result is None:
+                    return
+                record = {'file_path': chunk[index], 'status': status, **result}
+                with write_lock:
+                    output.write(json.dumps(record) + '\n')
+                    output.flush()
+                    written += 1
+
+            try:
+                _, job_data, _ = process_resumes(
+                    job_text, resume_files, model, config=config, progress_callback=progress_callback
+                )
+            finally:
+                for resume_file in resume_files:
+                    resume_file.close()
+
+            os.fsync(output.fileno())
+            save_state(state_path, {**state, 'job_data': job_data, 'completed': written})
+            print(f"Checkpoint: {written}/{len(resumes)} resumes scored")
+
+    print(f"Done. Results in {output_path}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('resume_dir', help='directory of PDF/DOCX resumes (searched recursively)')
+    parser.add_argument('job_file', help='job description as .txt, .pdf or .docx')
+    parser.add_argument('-o', '--output', default='results.jsonl', help='JSONL output, also the checkpoint (default: results.jsonl)')
+    parser.add_argument('--chunk-size', type=int, default=200, help='resumes processed per checkpoint, also the pre-ranking scope (default: 200)')
+    parser.add_argument('--workers', type=int, help='concurrent extractions/LLM calls (default: MAX_CONCURRENT_ANALYSES)')
+    parser.add_argument('--extract-workers', type=int, help='processes for PDF/DOCX parsing (default: EXTRACT_WORKERS)')
+    parser.add_argument('--refresh', action='store_true', help='ignore cached LLM analyses')
+    parser.add_argument('--restart', action='store_true', help='discard existing output and start over')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.resume_dir):
+        parser.error(f"{args.resume_dir} is not a directory")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    return match(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import csv
+import io
+
+
+def _join(separator):
+    return lambda values: separator.join(values) if values else ''
+
+
+# (CSV header, result key, default, formatter) in export column order
+CSV_COLUMNS = [
+    ('Candidate Name', 'candidate_name', None, None),
+    ('Overall Score', 'overall_score', None, None),
+    ('AI Verdict', 'verdict', None, None),
+    ('Technical Skills Score', 'technical_skills_score', 'N/A', None),
+    ('Experience Score', 'experience_score', 'N/A', None),
+    ('Education Score', 'education_score', 'N/A', None),
+    ('Profile Quality Score', 'profile_quality_score', 'N/A', None),
+    ('Years of Experience', 'years_of_experience', 'N/A', None),
+    ('Experience Match', 'experience_match', 'N/A', None),
+    ('Education Match', 'education_match', 'N/A', None),
+    ('Matched Skills Count', 'matched_skills', [], len),
+    ('Missing Skills Count', 'missing_skills', [], len),
+    ('Matched Skills', 'matched_skills', [], _join(', ')),
+    ('Missing Skills', 'missing_skills', [], _join(', ')),
+    ('Key Achievements', 'key_achievements', [], _join(' | ')),
+    ('Strengths', 'strengths', [], _join(' | ')),
+    ('Recommendations', 'recommendations', [], _join(' | ')),
+    # Appended so existing positional readers of the export keep working
+    ('Scoring Tier', 'scoring_tier', 'N/A', None),
+]
+
+
+def csv_row(result):
+    """One export row for a result, in CSV_COLUMNS order"""
+    row = []
+    for _, key, default, formatter in CSV_COLUMNS:
+        value = result[key] if default is None else result.get(key, default)
+        row.append(formatter(value) if formatter else value)
+    return row
+
+
+def iter_csv(results, batch_rows=200):
+    """Yield CSV text a batch of rows at a time, header first"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow([header for header, _, _, _ in CSV_COLUMNS])
+
+    rows = 0
+    for result in results:
+        writer.writerow(csv_row(result))
+        rows += 1
+        if rows % batch_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+# Columnar exports keep native types: numbers stay numeric (null when a
+# field is missing) and skill/strength lists stay lists
+COLUMNAR_FIELDS = [
+    ('rank', 'int32'),
+    ('candidate_name', 'string'),
+    ('file_name', 'string'),
+    ('overall_score', 'int32'),
+    ('verdict', 'string'),
+    ('scoring_tier', 'int8'),
+    ('technical_skills_score', 'float64'),
+    ('experience_score', 'float64'),
+    ('education_score', 'float64'),
+    ('profile_quality_score', 'float64'),
+    ('years_of_experience', 'float64'),
+    ('experience_match', 'string'),
+    ('education_match', 'string'),
+    ('prerank_score', 'float64'),
+    ('shortlisted', 'bool'),
+    ('matched_skills', 'list<string>'),
+    ('missing_skills', 'list<string>'),
+    ('key_achievements', 'list<string>'),
+    ('strengths', 'list<string>'),
+    ('recommendations', 'list<string>'),
+]
+
+# format -> (file extension, MIME type)
+COLUMNAR_FORMATS = {
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'arrow': ('arrow', 'application/vnd.apache.arrow.file'),
+}
+
+
+def _arrow_schema(pa):
+    types = {
+        'int32': pa.int32(), 'int8': pa.int8(), 'float64': pa.float64(),
+        'string': pa.string(), 'bool': pa.bool_(), 'list<string>': pa.list_(pa.string()),
+    }
+    return pa.schema([(name, types[type_name]) for name, type_name in COLUMNAR_FIELDS])
+
+
+def _columnar_value(value, type_name):
+    if value is None:
+        return None
+    try:
+        if type_name in ('int32', 'int8'):
+            return int(value)
+        if type_name == 'float64':
+            return float(value)
+    except (TypeError, ValueError):
+        # e.g. a model returning "5+" years; unknown rather than a failed export
+        return None
+    if type_name == 'list<string>':
+        return [str(item) for item in value]
+    if type_name == 'string':
+        return str(value)
+    return value
+
+
+def write_columnar(results, target, file_format='parquet', batch_rows=1000):
+    """Write results to a binary file object as Parquet or Arrow IPC.
+
+    Rows are converted one record batch at a time, so memory stays flat for
+    large runs. Needs pyarrow, which is optional; ImportError otherwise.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("Columnar export needs pyarrow (pip install pyarrow)")
+
+    schema = _arrow_schema(pa)
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(target, schema)
+        write_batch = writer.write_batch
+    elif file_format == 'arrow':
+        writer = pa.ipc.new_file(target, schema)
+        write_batch = writer.write_batch
+    else:
+        raise ValueError(f"Unknown columnar format: {file_format}")
+
+    def flush(rows):
+        columns = {name: [] for name, _ in COLUMNAR_FIELDS}
+        for rank, result in rows:
+            values = {**result, 'rank': rank}
+            for name, type_name in COLUMNAR_FIELDS:
+                columns[name].append(_columnar_value(values.get(name), type_name))
+        write_batch(pa.RecordBatch.from_pydict(columns, schema=schema))
+
+    try:
+        rows = []
+        for rank, result in enumerate(results):
+            rows.append((rank, result))
+            if len(rows) == batch_rows:
+                flush(rows)
+                rows = []
+        if rows:
+            flush(rows)
+    finally:
+        writer.close()
@@ -0,0 +1,121 @@
+import os
+import random
+import threading
+import time
+
+MODEL_NAME = os.environ.get('GEMINI_MODEL', 'gemini-pro')
+
+# Client-side quota: sustained requests per minute and how many may burst at once
+REQUESTS_PER_MINUTE = float(os.environ.get('GEMINI_RPM', '60'))
+BURST_SIZE = int(os.environ.get('GEMINI_BURST', '5'))
+
+# Retries for quota and transient server errors, with exponential backoff and jitter
+MAX_RETRIES = int(os.environ.get('GEMINI_MAX_RETRIES', '4'))
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+# HTTP/gRPC status codes worth retrying: quota, internal error, unavailable, deadline
+RETRYABLE_STATUS_CODES = {429, 500, 503, 504}
+
+
+# Load environment variables
+def load_api_key():
+    api_key = os.environ.get('GEMINI_API_KEY')
+    if api_key:
+        return api_key.strip()
+    try:
+        with open('.env', 'r') as f:
+            for line in f:
+                if line.startswith('GEMINI_API_KEY='):
+                    return line.split('=')[1].strip()
+    except:
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a request may be sent"""
+    def __init__(self, rate_per_second, capacity):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def is_retryable(error):
+    """True for quota exhaustion and transient server-side failures"""
+    code = getattr(error, 'code', None)
+    # google.api_core exceptions expose the HTTP status as .code
+    if isinstance(code, int) and code in RETRYABLE_STATUS_CODES:
+        return True
+    return type(error).__name__ in {
+        'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable',
+        'InternalServerError', 'DeadlineExceeded', 'GatewayTimeout'
+    } or isinstance(error, (TimeoutError, ConnectionError))
+
+
+def backoff_delay(attempt):
+    """Exponential backoff with equal jitter for the given retry attempt (0-based)"""
+    ceiling = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+class RateLimitedModel:
+    """GenerativeModel proxy that throttles and retries generate_content"""
+    def __init__(self, model, limiter, max_retries=MAX_RETRIES):
+        self._model = model
+        self._limiter = limiter
+        self._max_retries = max_retries
+
+    def generate_content(self, *args, **kwargs):
+        attempt = 0
+        while True:
+            self._limiter.acquire()
+            try:
+                return self._model.generate_content(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self._max_retries or not is_retryable(e):
+                    raise
+                delay = backoff_delay(attempt)
+                attempt += 1
+                print(f"Gemini call failed ({type(e).__name__}: {e}), retry {attempt}/{self._max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+
+_model = None
+_model_lock = threading.Lock()
+
+# Shared across requests, jobs and threads so the rate limit is process-wide
+_limiter = TokenBucket(REQUESTS_PER_MINUTE / 60.0, BURST_SIZE)
+
+
+def get_model():
+    """Return the process-wide Gemini model, creating it on first use"""
+    global _model
+    with _model_lock:
+        if _model is None:
+            api_key = load_api_key()
+            if not api_key:
+                raise ValueError("GEMINI_API_KEY not found in environment or .env file")
+
+            # Imported on first use; the SDK is slow to import and most requests never need it
+            import google.generativeai as genai
+
+            genai.configure(api_key=api_key)
+            _model = RateLimitedModel(genai.GenerativeModel(MODEL_NAME), _limiter)
+        return _model
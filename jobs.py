@@ -0,0 +1,126 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# How long finished jobs are kept around for status polling
+JOB_RETENTION_SECONDS = 3600
+
+
+class JobManager:
+    """Runs analysis jobs on a local worker pool and tracks per-resume progress"""
+    def __init__(self, max_workers=2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+        # Wakes stream readers whenever a job reports progress or finishes
+        self._changed = threading.Condition(self._lock)
+
+    def submit(self, func, file_names, *args, **kwargs):
+        """Queue func(*args, progress_callback=..., **kwargs) and return the job id.
+
+        Whatever func returns is kept as the job result.
+        """
+        self._prune()
+        job_id = uuid.uuid4().hex
+        job = {
+            'id': job_id,
+            'status': 'queued',
+            'created_at': time.time(),
+            'finished_at': None,
+            'resumes': [{'file_name': name, 'status': 'pending'} for name in file_names],
+            # Finished candidates in completion order, for streaming
+            'events': [],
+            'result': None,
+            'error': None
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+
+        def progress_callback(index, status, result=None):
+            with self._lock:
+                if 0 <= index < len(job['resumes']):
+                    job['resumes'][index]['status'] = status
+                    if result is not None:
+                        job['events'].append({'index': index, 'status': status, 'result': result})
+                    self._changed.notify_all()
+
+        def run():
+            with self._lock:
+                job['status'] = 'running'
+            try:
+                result = func(*args, progress_callback=progress_callback, **kwargs)
+                with self._lock:
+                    job['result'] = result
+                    job['status'] = 'completed'
+            except Exception as e:
+                print(f"Analysis job {job_id} failed: {e}")
+                with self._lock:
+                    job['error'] = str(e)
+                    job['status'] = 'failed'
+            finally:
+                with self._lock:
+                    job['finished_at'] = time.time()
+                    self._changed.notify_all()
+
+        self._executor.submit(run)
+        return job_id
+
+    def get(self, job_id):
+        """Return the job record, or None if unknown"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job_id):
+        """Return a JSON-friendly progress snapshot for the job"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+
+            counts = {'pending': 0, 'in_flight': 0, 'done': 0, 'failed': 0}
+            for resume in job['resumes']:
+                counts[resume['status']] += 1
+
+            return {
+                'job_id': job_id,
+                'status': job['status'],
+                'error': job['error'],
+                'total': len(job['resumes']),
+                'progress': counts,
+                'resumes': [dict(resume) for resume in job['resumes']]
+            }
+
+    def status_counts(self):
+        """Number of tracked jobs in each status"""
+        counts = {'queued': 0, 'running': 0, 'completed': 0, 'failed': 0}
+        with self._lock:
+            for job in self._jobs.values():
+                counts[job['status']] += 1
+        return counts
+
+    def wait_events(self, job_id, cursor=0, timeout=15):
+        """Block until the job has events past cursor or finishes (or timeout).
+
+        Returns (new events, next cursor, finished), or None if the job is unknown.
+        """
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            self._changed.wait_for(
+                lambda: len(job['events']) > cursor or job['finished_at'] is not None,
+                timeout=timeout
+            )
+            events = job['events'][cursor:]
+            return events, cursor + len(events), job['finished_at'] is not None
+
+    def _prune(self):
+        cutoff = time.time() - JOB_RETENTION_SECONDS
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job['finished_at'] and job['finished_at'] < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
@@ -0,0 +1,204 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Counters, gauges and histograms with labels, kept per process and guarded by
+a lock; no client library is needed. processor records stage latencies, LLM
+outcomes and bytes/characters processed here and /metrics serves render().
+"""
+import functools
+import threading
+import time
+
+# Seconds; spans a regex pass over one resume up to a slow LLM call
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _label_text(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._sample_lines(key, value))
+        return lines
+
+    def _sample_lines(self, key, value):
+        return [f"{self.name}{_label_text(self.label_names, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['counts'][position] += 1
+                    break
+            state['sum'] += value
+            state['count'] += 1
+
+    def time(self, **labels):
+        """Context manager observing the duration of its block in seconds"""
+        return _Timer(self, labels)
+
+    def _sample_lines(self, key, state):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, state['counts']):
+            cumulative += count
+            labels = _label_text(self.label_names, key, [('le', _format_value(float(bound)))])
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _label_text(self.label_names, key)
+        lines.append(f"{self.name}_bucket{_label_text(self.label_names, key, [('le', '+Inf')])} {state['count']}")
+        lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._histogram.observe(time.perf_counter() - self._start, **self._labels)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """All metrics in the Prometheus text format (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+# Content type Prometheus expects from a text-format scrape
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'resume_matcher_stage_duration_seconds',
+    'Time spent in each pipeline stage, per call.',
+    ['stage'],
+    buckets=DEFAULT_BUCKETS + (120, 300, 600)
+))
+LLM_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'resume_matcher_llm_request_duration_seconds',
+    'Latency of Gemini generate_content calls, including client retries.',
+    ['call']
+))
+LLM_CALLS = REGISTRY.register(Counter(
+    'resume_matcher_llm_calls_total',
+    'LLM-backed operations by outcome: success, fallback (local result used) or cached.',
+    ['call', 'outcome']
+))
+DOCUMENTS = REGISTRY.register(Counter(
+    'resume_matcher_documents_total',
+    'Documents seen by text extraction, by type and outcome (parsed, cached, error).',
+    ['file_type', 'outcome']
+))
+DOCUMENT_BYTES = REGISTRY.register(Counter(
+    'resume_matcher_document_bytes_total',
+    'Bytes of PDF/DOCX documents parsed (text cache misses).',
+    ['file_type']
+))
+TEXT_CHARS = REGISTRY.register(Counter(
+    'resume_matcher_text_chars_total',
+    'Characters of text handled by each stage.',
+    ['stage']
+))
+JOBS = REGISTRY.register(Gauge(
+    'resume_matcher_analysis_jobs',
+    'Background analysis jobs currently tracked, by status.',
+    ['status']
+))
+
+
+def timed(stage):
+    """Decorator recording each call of the function under STAGE_SECONDS{stage=...}"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+        return wrapper
+    return decorator
@@ -1,71 +1,372 @@
-import google.generativeai as genai
-import PyPDF2
-from docx import Document
-import pandas as pd
+# PyPDF2, python-docx and numpy are imported where they are used so that
+# importing this module (and starting the web app) stays cheap
 import os
+import posixpath
 import re
 import json
+import hashlib
+import threading
+import time
 from io import BytesIO
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from cache import DiskCache
+from metrics import DOCUMENTS, DOCUMENT_BYTES, LLM_CALLS, LLM_REQUEST_SECONDS, TEXT_CHARS, STAGE_SECONDS, timed
+from gemini_client import get_model
+from skills import get_skill_matcher, normalize_skill
+from ranking import bm25_scores, normalize_scores, shortlist
+from uploads import ARCHIVE_TYPES, CHUNK_SIZE, MemoryFile, iter_archive_members, open_mapped
 
-# Load environment variables
-def load_api_key():
-    try:
-        with open('.env', 'r') as f:
-            for line in f:
-                if line.startswith('GEMINI_API_KEY='):
-                    return line.split('=')[1].strip()
-    except:
+# Local directory for on-disk caches
+CACHE_DIR = os.environ.get('CACHE_DIR', 'cache')
+
+# Cleaned resume text keyed by a hash of the uploaded file bytes
+text_cache = DiskCache(
+    os.path.join(CACHE_DIR, 'extracted_text.sqlite3'),
+    max_bytes=int(os.environ.get('TEXT_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+)
+
+# Structured job_data keyed on a hash of the whitespace-normalized JD text
+job_cache = DiskCache(
+    os.path.join(CACHE_DIR, 'job_descriptions.sqlite3'),
+    max_bytes=int(os.environ.get('JOB_CACHE_MAX_BYTES', str(16 * 1024 * 1024))),
+    ttl=int(os.environ.get('JOB_CACHE_TTL', str(30 * 24 * 3600)))
+)
+
+# One in-flight parse per JD: concurrent callers wait and then read the cache.
+# A fixed set of striped locks, so long-running workers don't collect one per JD.
+_job_parse_locks = [threading.Lock() for _ in range(64)]
+
+# Characters of resume text each pipeline stage uses. Extraction stops once the
+# largest budget is covered, so pages beyond what scoring needs are never parsed.
+TEXT_BUDGETS = {
+    'prompt': int(os.environ.get('PROMPT_TEXT_CHARS', '3000')),
+    'skills': int(os.environ.get('SKILL_TEXT_CHARS', '20000')),
+}
+EXTRACT_MAX_CHARS = max(TEXT_BUDGETS.values())
+EXTRACT_MAX_PAGES = int(os.environ.get('EXTRACT_MAX_PAGES', '10'))
+
+# Bump whenever the analyze_resume prompt or scoring changes so stale results are not reused
+PROMPT_VERSION = 5
+
+# Successful LLM analyses keyed on (resume text, job data, prompt version)
+analysis_cache = DiskCache(
+    os.path.join(CACHE_DIR, 'analysis_results.sqlite3'),
+    max_bytes=int(os.environ.get('ANALYSIS_CACHE_MAX_BYTES', str(64 * 1024 * 1024))),
+    ttl=int(os.environ.get('ANALYSIS_CACHE_TTL', str(7 * 24 * 3600)))
+)
+
+# Parse a "low-high" score band such as "45-80" from the environment
+def _env_score_band(name):
+    value = os.environ.get(name, '').strip()
+    if not value:
         return None
+    low, high = value.split('-')
+    return float(low), float(high)
+
+# Pipeline settings, overridable per call through process_resumes(config=...)
+PIPELINE_CONFIG = {
+    # Maximum number of resumes extracted and analyzed at the same time
+    'max_workers': int(os.environ.get('MAX_CONCURRENT_ANALYSES', '4')),
+    # Ignore cached LLM analyses and call the model again
+    'refresh': False,
+    # Local BM25 pre-ranking: only the best matches go to the LLM, the rest
+    # get the deterministic score. 0 disables either cut. Off by default, since
+    # it puts tier-1 and Gemini scores into one ranking.
+    'shortlist_size': int(os.environ.get('PRERANK_TOP_K', '0')),
+    'shortlist_min_score': float(os.environ.get('PRERANK_MIN_SCORE', '0')),
+    # Tiered scoring: every resume gets the tier-1 deterministic score; Gemini
+    # (tier 2) only refines those whose tier-1 score is inside the band or in
+    # the tier-1 top N. With neither set, the whole shortlist is refined.
+    'tier2_band': _env_score_band('TIER2_SCORE_BAND'),
+    'tier2_top_n': int(os.environ.get('TIER2_TOP_N', '0')),
+    # Batched prompts: pack up to llm_batch_size resumes into one Gemini call,
+    # keeping each prompt under llm_batch_token_budget. 1 disables batching.
+    'llm_batch_size': int(os.environ.get('LLM_BATCH_SIZE', '1')),
+    'llm_batch_token_budget': int(os.environ.get('LLM_BATCH_TOKEN_BUDGET', '12000')),
+    # Document parsing in a process pool; 0 or 1 extracts on the analysis threads
+    'extract_workers': int(os.environ.get('EXTRACT_WORKERS', '0')),
+    # Files handed to an extraction worker at a time
+    'extract_chunksize': int(os.environ.get('EXTRACT_CHUNKSIZE', '4')),
+    # Archive members larger than this are rejected instead of parsed
+    'archive_member_max_bytes': int(os.environ.get('ARCHIVE_MEMBER_MAX_BYTES', str(5 * 1024 * 1024))),
+}
 
-# Initialize Gemini
+# Initialize Gemini: the model is created once per process and shared, with
+# client-side rate limiting and retries (see gemini_client)
 def initialize_gemini():
-    api_key = load_api_key()
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not found in .env file")
-    
-    genai.configure(api_key=api_key)
-    return genai.GenerativeModel('gemini-pro')
+    return get_model()
+
+# Seekable streams are parsed in place; anything else is read into memory once
+def as_document_stream(file):
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    if hasattr(file, 'seekable') and file.seekable():
+        return file
+    return BytesIO(file.read())
+
+# Extract text from PDF, stopping once max_chars or max_pages is reached
+def extract_pdf_text(file, max_chars=None, max_pages=None):
+    import PyPDF2
 
-# Extract text from PDF
-def extract_pdf_text(file):
     try:
-        pdf_reader = PyPDF2.PdfReader(BytesIO(file.read()))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
+        pdf_reader = PyPDF2.PdfReader(as_document_stream(file))
+        parts = []
+        extracted_chars = 0
+        for page_number, page in enumerate(pdf_reader.pages):
+            if max_pages is not None and page_number >= max_pages:
+                break
+            page_text = page.extract_text()
+            parts.append(page_text)
+            extracted_chars += len(page_text) + 1
+            if max_chars is not None and extracted_chars >= max_chars:
+                break
+        text = "\n".join(parts).strip()
+        return text[:max_chars] if max_chars is not None else text
     except Exception as e:
         return f"Error reading PDF: {str(e)}"
 
-# Extract text from DOCX
-def extract_docx_text(file):
+# Extract text from DOCX, stopping once max_chars is reached
+def extract_docx_text(file, max_chars=None, max_pages=None):
+    # DOCX has no reliable page boundaries, so only the character budget applies
+    from docx import Document
+
     try:
-        doc = Document(BytesIO(file.read()))
-        text = ""
+        doc = Document(as_document_stream(file))
+        parts = []
+        extracted_chars = 0
         for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text.strip()
+            parts.append(paragraph.text)
+            extracted_chars += len(paragraph.text) + 1
+            if max_chars is not None and extracted_chars >= max_chars:
+                break
+        text = "\n".join(parts).strip()
+        return text[:max_chars] if max_chars is not None else text
     except Exception as e:
         return f"Error reading DOCX: {str(e)}"
 
-# Extract text from uploaded file
-def extract_text_from_file(uploaded_file):
-    if uploaded_file.type == "application/pdf":
-        return extract_pdf_text(uploaded_file)
-    elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        return extract_docx_text(uploaded_file)
+# Text extractor for each supported MIME type
+DOCUMENT_EXTRACTORS = {
+    "application/pdf": extract_pdf_text,
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": extract_docx_text,
+}
+
+# Short file type names used as metric labels
+DOCUMENT_KINDS = {
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+}
+
+# SHA-256 of an uploaded file: precomputed at upload time when available,
+# otherwise hashed in chunks without loading the whole file
+def file_content_hash(uploaded_file):
+    content_hash = getattr(uploaded_file, 'content_hash', None)
+    if content_hash:
+        return content_hash
+    
+    digest = hashlib.sha256()
+    uploaded_file.seek(0)
+    for chunk in iter(lambda: uploaded_file.read(CHUNK_SIZE), b''):
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+# Size in bytes of an uploaded file without reading it, or None if it can't be told
+def file_size(uploaded_file):
+    path = getattr(uploaded_file, 'path', None)
+    if path:
+        return os.path.getsize(path)
+    if not (hasattr(uploaded_file, 'seekable') and uploaded_file.seekable()):
+        return None
+    position = uploaded_file.tell()
+    size = uploaded_file.seek(0, 2)
+    uploaded_file.seek(position)
+    return size
+
+# Count one parsed document (text cache miss) towards the extraction metrics
+def record_extraction(file_type, size, text):
+    kind = DOCUMENT_KINDS.get(file_type, 'other')
+    outcome = 'error' if text.startswith("Error") else 'parsed'
+    DOCUMENTS.inc(file_type=kind, outcome=outcome)
+    if size is not None:
+        DOCUMENT_BYTES.inc(size, file_type=kind)
+    if outcome == 'parsed':
+        TEXT_CHARS.inc(len(text), stage='extract_text')
+
+# Cache key for a document: its type, a hash of its bytes and the extraction budget
+def text_cache_key(file_type, content_hash, max_chars=None, max_pages=None):
+    return f"{file_type}:{content_hash}:{max_chars}:{max_pages}"
+
+# Parse a document into cleaned text (also runs in extraction worker processes).
+# source is a file path (memory-mapped, never copied), raw bytes or a binary stream.
+def extract_document(file_type, source, max_chars=None, max_pages=None):
+    extractor = DOCUMENT_EXTRACTORS.get(file_type)
+    if extractor is None:
+        return "Unsupported file format"
+    
+    if isinstance(source, str):
+        stream = open_mapped(source)
+        try:
+            text = extractor(stream, max_chars, max_pages)
+        finally:
+            stream.close()
+    elif isinstance(source, bytes):
+        text = extractor(BytesIO(source), max_chars, max_pages)
     else:
+        text = extractor(source, max_chars, max_pages)
+    
+    if text.startswith("Error"):
+        return text
+    return clean_text(text)
+
+# extract_document for the extraction pool: also returns the parse time, so
+# per-document latency can be recorded in the parent process
+def extract_document_timed(file_type, source, max_chars=None, max_pages=None):
+    start = time.perf_counter()
+    text = extract_document(file_type, source, max_chars, max_pages)
+    return text, time.perf_counter() - start
+
+# Extract text from uploaded file, within the extraction budget. The defaults
+# are the resume budget; pass max_chars=None, max_pages=None to read everything.
+@timed('extract_text')
+def extract_text_from_file(uploaded_file, max_chars=EXTRACT_MAX_CHARS, max_pages=EXTRACT_MAX_PAGES):
+    if uploaded_file.type not in DOCUMENT_EXTRACTORS:
+        DOCUMENTS.inc(file_type='other', outcome='unsupported')
         return "Unsupported file format"
+    
+    # Identical uploads skip parsing entirely
+    cache_key = text_cache_key(uploaded_file.type, file_content_hash(uploaded_file), max_chars, max_pages)
+    cached_text = text_cache.get(cache_key)
+    if cached_text is not None:
+        DOCUMENTS.inc(file_type=DOCUMENT_KINDS[uploaded_file.type], outcome='cached')
+        return cached_text
+    
+    text = extract_document(uploaded_file.type, uploaded_file, max_chars, max_pages)
+    record_extraction(uploaded_file.type, file_size(uploaded_file), text)
+    if not text.startswith("Error"):
+        text_cache.set(cache_key, text)
+    return text
+
+# Shared process pool for CPU-bound document parsing, created on first use
+_extraction_pool = None
+_extraction_pool_workers = 0
+_extraction_pool_lock = threading.Lock()
+
+def get_extraction_pool(workers):
+    global _extraction_pool, _extraction_pool_workers
+    with _extraction_pool_lock:
+        if _extraction_pool is None or _extraction_pool_workers != workers:
+            if _extraction_pool is not None:
+                _extraction_pool.shutdown(wait=False)
+            # spawn: forking a process that runs job threads is not safe
+            _extraction_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _extraction_pool_workers = workers
+        return _extraction_pool
+
+def reset_extraction_pool():
+    global _extraction_pool, _extraction_pool_workers
+    with _extraction_pool_lock:
+        if _extraction_pool is not None:
+            _extraction_pool.shutdown(wait=False)
+        _extraction_pool = None
+        _extraction_pool_workers = 0
+
+# Extract many files at once, parsing cache misses across CPU cores
+def extract_texts_parallel(resume_files, workers, chunksize=4, max_chars=EXTRACT_MAX_CHARS, max_pages=EXTRACT_MAX_PAGES):
+    """Return cleaned text (or an "Error..." string) for every file, in input order"""
+    texts = [None] * len(resume_files)
+    misses = []
+    
+    for index, uploaded_file in enumerate(resume_files):
+        if uploaded_file.type not in DOCUMENT_EXTRACTORS:
+            DOCUMENTS.inc(file_type='other', outcome='unsupported')
+            texts[index] = "Unsupported file format"
+            continue
+        
+        cache_key = text_cache_key(uploaded_file.type, file_content_hash(uploaded_file), max_chars, max_pages)
+        cached_text = text_cache.get(cache_key)
+        if cached_text is not None:
+            DOCUMENTS.inc(file_type=DOCUMENT_KINDS[uploaded_file.type], outcome='cached')
+            texts[index] = cached_text
+        else:
+            # Files on disk are sent by path and memory-mapped by the worker;
+            # only in-memory uploads have to be pickled across
+            source = getattr(uploaded_file, 'path', None) or as_document_stream(uploaded_file).read()
+            misses.append((index, uploaded_file.type, source, cache_key))
+    
+    if misses:
+        file_types = [file_type for _, file_type, _, _ in misses]
+        sources = [source for _, _, source, _ in misses]
+        budget = [max_chars] * len(misses), [max_pages] * len(misses)
+        try:
+            outputs = list(get_extraction_pool(workers).map(
+                extract_document_timed, file_types, sources, *budget, chunksize=chunksize
+            ))
+        except BrokenProcessPool as e:
+            print(f"Extraction pool failed ({e}), extracting in-process")
+            reset_extraction_pool()
+            outputs = list(map(extract_document_timed, file_types, sources, *budget))
+        for (index, file_type, source, cache_key), (text, seconds) in zip(misses, outputs):
+            STAGE_SECONDS.observe(seconds, stage='extract_text')
+            record_extraction(file_type, os.path.getsize(source) if isinstance(source, str) else len(source), text)
+            texts[index] = text
+            if not text.startswith("Error"):
+                text_cache.set(cache_key, text)
+    
+    return texts
 
 # Clean and normalize text
+@timed('clean_text')
 def clean_text(text):
     # Remove extra whitespace and normalize
     text = re.sub(r'\s+', ' ', text)
     text = re.sub(r'\n+', '\n', text)
     return text.strip()
 
-# Parse job description using Gemini
-def parse_job_description(jd_text, model):
+# Stable hash of the job requirements, independent of key order and stray whitespace
+def job_data_fingerprint(job_data):
+    def normalize(value):
+        if isinstance(value, str):
+            return ' '.join(value.split())
+        if isinstance(value, list):
+            return [normalize(v) for v in value]
+        if isinstance(value, dict):
+            return {k: normalize(v) for k, v in value.items()}
+        return value
+    
+    payload = json.dumps(normalize(job_data), sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+# Cache key for a job description, ignoring whitespace differences
+def job_text_fingerprint(jd_text):
+    normalized = ' '.join(jd_text.split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+# Parse job description using Gemini, reusing earlier parses of the same text
+@timed('parse_job_description')
+def parse_job_description(jd_text, model, refresh=False):
+    cache_key = job_text_fingerprint(jd_text)
+    
+    parse_lock = _job_parse_locks[int(cache_key[:8], 16) % len(_job_parse_locks)]
+    
+    with parse_lock:
+        if not refresh:
+            cached_job = job_cache.get(cache_key)
+            if cached_job is not None:
+                LLM_CALLS.inc(call='job_description', outcome='cached')
+                return json.loads(cached_job)
+        
+        job_data, parsed = _parse_job_description(jd_text, model)
+        LLM_CALLS.inc(call='job_description', outcome='success' if parsed else 'fallback')
+        if parsed:
+            job_cache.set(cache_key, json.dumps(job_data))
+        return job_data
+
+def _parse_job_description(jd_text, model):
     prompt = f"""
     Analyze this job description and extract key information in JSON format:
     
@@ -89,7 +390,8 @@ def parse_job_description(jd_text, model):
     """
     
     try:
-        response = model.generate_content(prompt)
+        with LLM_REQUEST_SECONDS.time(call='job_description'):
+            response = model.generate_content(prompt)
         json_str = response.text.strip()
         if json_str.startswith('```json'):
             json_str = json_str.replace('```json', '').replace('```', '').strip()
@@ -102,7 +404,7 @@ def parse_job_description(jd_text, model):
         if not isinstance(parsed_data.get('good_to_have_skills', []), list):
             parsed_data['good_to_have_skills'] = ["AWS", "Docker"]
             
-        return parsed_data
+        return parsed_data, True
         
     except Exception as e:
         print(f"Error parsing job description: {e}")
@@ -113,24 +415,16 @@ def parse_job_description(jd_text, model):
             "good_to_have_skills": ["AWS", "Docker", "MongoDB"],
             "experience_required": "2-5 years",
             "education_required": "Bachelor's degree"
-        }
+        }, False
 
 # Improved skill matching function
+@timed('skill_match')
 def calculate_skill_match_score(resume_text, must_have_skills, good_to_have_skills):
     """Calculate skill match score with better logic"""
-    resume_lower = resume_text.lower()
-    
-    # Find matched must-have skills
-    matched_must_have = []
-    for skill in must_have_skills:
-        if skill.lower() in resume_lower:
-            matched_must_have.append(skill)
-    
-    # Find matched good-to-have skills
-    matched_good_to_have = []
-    for skill in good_to_have_skills:
-        if skill.lower() in resume_lower:
-            matched_good_to_have.append(skill)
+    TEXT_CHARS.inc(len(resume_text), stage='skill_match')
+    # Compiled once per job skill set; one pass over the text finds every skill
+    matcher = get_skill_matcher(must_have_skills, good_to_have_skills)
+    matched_must_have, matched_good_to_have, missing_must_have = matcher.match(resume_text)
     
     # Calculate scores
     must_have_score = (len(matched_must_have) / len(must_have_skills)) * 60 if must_have_skills else 0
@@ -139,9 +433,6 @@ def calculate_skill_match_score(resume_text, must_have_skills, good_to_have_skil
     
     total_score = int(base_score + must_have_score + good_to_have_score)
     
-    # Find missing skills
-    missing_must_have = [skill for skill in must_have_skills if skill not in matched_must_have]
-    
     return {
         'total_score': min(100, total_score),
         'matched_skills': matched_must_have + matched_good_to_have,
@@ -149,21 +440,204 @@ def calculate_skill_match_score(resume_text, must_have_skills, good_to_have_skil
         'skill_match_rate': (len(matched_must_have) / len(must_have_skills)) * 100 if must_have_skills else 0
     }
 
-# Enhanced resume analysis
-def analyze_resume(resume_text, job_data, model):
-    # First, get basic skill matching
-    skill_analysis = calculate_skill_match_score(
-        resume_text, 
-        job_data.get('must_have_skills', []), 
-        job_data.get('good_to_have_skills', [])
+# Skill matching for a whole batch as a resumes x skills boolean matrix
+@timed('skill_match_batch')
+def calculate_batch_skill_scores(resume_texts, must_have_skills, good_to_have_skills):
+    """Return (per-resume skill analyses, match matrix) computed with array operations"""
+    import numpy as np
+    
+    TEXT_CHARS.inc(sum(len(text) for text in resume_texts), stage='skill_match')
+
+    matcher = get_skill_matcher(must_have_skills, good_to_have_skills)
+    must_count = len(must_have_skills)
+    good_count = len(good_to_have_skills)
+    
+    # Columns are must-have skills followed by good-to-have skills
+    matrix = np.zeros((len(resume_texts), must_count + good_count), dtype=bool)
+    for row, text in enumerate(resume_texts):
+        found = matcher.matched_indexes(text)
+        if found:
+            matrix[row, list(found)] = True
+    
+    must_matrix = matrix[:, :must_count]
+    good_matrix = matrix[:, must_count:]
+    must_rates = must_matrix.mean(axis=1) if must_count else np.zeros(len(resume_texts))
+    good_rates = good_matrix.mean(axis=1) if good_count else np.zeros(len(resume_texts))
+    
+    # Same weights as calculate_skill_match_score: 25 base, 60 must-have, 15 good-to-have
+    total_scores = np.minimum(100, (25 + must_rates * 60 + good_rates * 15).astype(int))
+    
+    must_names = np.array(must_have_skills, dtype=object)
+    good_names = np.array(good_to_have_skills, dtype=object)
+    analyses = []
+    for row in range(len(resume_texts)):
+        analyses.append({
+            'total_score': int(total_scores[row]),
+            'matched_skills': list(must_names[must_matrix[row]]) + list(good_names[good_matrix[row]]),
+            'missing_skills': list(must_names[~must_matrix[row]]),
+            'skill_match_rate': float(must_rates[row] * 100) if must_count else 0
+        })
+    
+    return analyses, matrix
+
+# Batch-level skill statistics from the match matrix
+def skill_batch_statistics(matrix, must_have_skills, good_to_have_skills):
+    must_count = len(must_have_skills)
+    candidate_count = matrix.shape[0]
+    if candidate_count == 0:
+        return {'candidates': 0, 'avg_skill_match_rate': 0, 'full_must_have_count': 0, 'skill_coverage': []}
+    
+    coverage_counts = matrix.sum(axis=0)
+    must_matrix = matrix[:, :must_count]
+    
+    return {
+        'candidates': int(candidate_count),
+        'avg_skill_match_rate': round(float(must_matrix.mean() * 100), 1) if must_count else 0,
+        'full_must_have_count': int(must_matrix.all(axis=1).sum()) if must_count else 0,
+        'skill_coverage': [
+            {
+                'skill': skill,
+                'type': 'must_have' if column < must_count else 'good_to_have',
+                'candidates': int(coverage_counts[column]),
+                'rate': round(float(coverage_counts[column] / candidate_count * 100), 1)
+            }
+            for column, skill in enumerate(list(must_have_skills) + list(good_to_have_skills))
+        ]
+    }
+
+# Tier 1: deterministic rule-based scoring, run for every resume and used
+# whenever the LLM is skipped or unavailable
+def score_resume_locally(resume_text, skill_analysis):
+    resume_lower = resume_text.lower()
+    
+    # Better experience estimation
+    years_mentioned = re.findall(r'(\d+)[\s\-]*(?:years?|yrs?)', resume_lower)
+    estimated_years = max([int(y) for y in years_mentioned]) if years_mentioned else 1
+    
+    # Better skill-based scoring
+    base_score = skill_analysis['total_score']
+    
+    # Experience bonus
+    if estimated_years >= 5:
+        base_score += 10
+    elif estimated_years >= 3:
+        base_score += 5
+    
+    # Education bonus
+    if any(edu in resume_lower for edu in ['bachelor', 'master', 'phd', 'degree']):
+        base_score += 8
+    
+    # Technical depth bonus
+    tech_keywords = ['project', 'developed', 'implemented', 'designed', 'built', 'created']
+    tech_count = sum(1 for word in tech_keywords if word in resume_lower)
+    base_score += min(tech_count * 2, 10)
+    
+    final_score = min(100, base_score)
+    
+    if final_score >= 75:
+        verdict = "Good Candidate - Proceed with Interview"
+    elif final_score >= 55:
+        verdict = "Potential Candidate - Review Carefully"
+    else:
+        verdict = "Below Requirements - Consider for Future"
+    
+    return {
+        "overall_score": final_score,
+        "verdict": verdict,
+        "matched_skills": skill_analysis['matched_skills'],
+        "missing_skills": skill_analysis['missing_skills'],
+        "strengths": ["Technical background present", "Relevant experience indicated"],
+        "recommendations": ["Strengthen missing technical skills", "Highlight specific achievements"],
+        "experience_match": "Good Match" if estimated_years >= 2 else "Limited Experience",
+        "education_match": "Adequate" if any(edu in resume_lower for edu in ['bachelor', 'master', 'degree']) else "Basic",
+        "key_achievements": [],
+        "years_of_experience": estimated_years,
+        "scoring_tier": 1
+    }
+
+# Cache key for an LLM analysis of one resume against one job
+def analysis_cache_key(resume_text, job_data):
+    return ":".join([
+        f"v{PROMPT_VERSION}",
+        hashlib.sha256(resume_text.encode('utf-8')).hexdigest(),
+        job_data_fingerprint(job_data)
+    ])
+
+# Strip markdown code fences around a model's JSON reply and parse it
+def parse_model_json(text):
+    json_str = text.strip()
+    if json_str.startswith('```json'):
+        json_str = json_str.replace('```json', '').replace('```', '').strip()
+    if json_str.startswith('```'):
+        json_str = json_str.replace('```', '').strip()
+    return json.loads(json_str)
+
+# Turn the model's per-candidate scores into a final analysis
+def build_ai_analysis(ai_analysis, skill_analysis):
+    # Calculate final score
+    final_score = (
+        ai_analysis.get('technical_skills_score', 20) +
+        ai_analysis.get('experience_score', 15) +
+        ai_analysis.get('education_score', 10) +
+        ai_analysis.get('profile_quality_score', 10)
     )
     
+    # Blend with skill matching score (weighted average)
+    blended_score = int((final_score * 0.7) + (skill_analysis['total_score'] * 0.3))
+    final_score = max(min(100, blended_score), 0)
+    
+    # Determine verdict
+    if final_score >= 80:
+        verdict = "Excellent Fit - Highly Recommended"
+    elif final_score >= 65:
+        verdict = "Good Fit - Recommended for Interview"
+    elif final_score >= 50:
+        verdict = "Moderate Fit - Consider with Reservations"
+    else:
+        verdict = "Poor Fit - Not Recommended"
+    
+    return {
+        "overall_score": final_score,
+        "verdict": verdict,
+        "matched_skills": skill_analysis['matched_skills'],
+        "missing_skills": skill_analysis['missing_skills'],
+        "strengths": ai_analysis.get('strengths', ["Shows relevant background"]),
+        "recommendations": ai_analysis.get('recommendations', ["Continue skill development"]),
+        "experience_match": ai_analysis.get('experience_match', 'Average Match'),
+        "education_match": ai_analysis.get('education_match', 'Satisfactory'),
+        "key_achievements": ai_analysis.get('key_achievements', []),
+        "years_of_experience": ai_analysis.get('years_of_experience', 0),
+        "technical_skills_score": ai_analysis.get('technical_skills_score', 20),
+        "experience_score": ai_analysis.get('experience_score', 15),
+        "education_score": ai_analysis.get('education_score', 10),
+        "profile_quality_score": ai_analysis.get('profile_quality_score', 10),
+        "scoring_tier": 2
+    }
+
+# Enhanced resume analysis
+@timed('analyze_resume')
+def analyze_resume(resume_text, job_data, model, refresh=False, skill_analysis=None):
+    cache_key = analysis_cache_key(resume_text, job_data)
+    if not refresh:
+        cached_analysis = analysis_cache.get(cache_key)
+        if cached_analysis is not None:
+            LLM_CALLS.inc(call='resume', outcome='cached')
+            return json.loads(cached_analysis)
+    
+    # First, get basic skill matching (precomputed for batches)
+    if skill_analysis is None:
+        skill_analysis = calculate_skill_match_score(
+            resume_text, 
+            job_data.get('must_have_skills', []), 
+            job_data.get('good_to_have_skills', [])
+        )
+    
     # Enhanced prompt for better analysis
     prompt = f"""
     You are an expert HR professional evaluating a resume against job requirements.
     
-    RESUME CONTENT (first 3000 chars):
-    {resume_text[:3000]}
+    RESUME CONTENT (first {TEXT_BUDGETS['prompt']} chars):
+    {resume_text[:TEXT_BUDGETS['prompt']]}
     
     JOB REQUIREMENTS:
     - Position: {job_data.get('job_title', 'Not specified')}
@@ -196,154 +670,540 @@ def analyze_resume(resume_text, job_data, model):
     """
     
     try:
-        response = model.generate_content(prompt)
-        json_str = response.text.strip()
-        
-        # Clean JSON response
-        if json_str.startswith('```json'):
-            json_str = json_str.replace('```json', '').replace('```', '').strip()
-        if json_str.startswith('```'):
-            json_str = json_str.replace('```', '').strip()
-        
-        # Parse the response
-        ai_analysis = json.loads(json_str)
+        with LLM_REQUEST_SECONDS.time(call='resume'):
+            response = model.generate_content(prompt)
+        ai_analysis = parse_model_json(response.text)
+        analysis = build_ai_analysis(ai_analysis, skill_analysis)
         
-        # Calculate final score
-        final_score = (
-            ai_analysis.get('technical_skills_score', 20) +
-            ai_analysis.get('experience_score', 15) +
-            ai_analysis.get('education_score', 10) +
-            ai_analysis.get('profile_quality_score', 10)
-        )
-        
-        # Blend with skill matching score (weighted average)
-        blended_score = int((final_score * 0.7) + (skill_analysis['total_score'] * 0.3))
-        final_score = max(min(100, blended_score), 0)
-        
-        # Determine verdict
-        if final_score >= 80:
-            verdict = "Excellent Fit - Highly Recommended"
-        elif final_score >= 65:
-            verdict = "Good Fit - Recommended for Interview"
-        elif final_score >= 50:
-            verdict = "Moderate Fit - Consider with Reservations"
-        else:
-            verdict = "Poor Fit - Not Recommended"
-        
-        return {
-            "overall_score": final_score,
-            "verdict": verdict,
-            "matched_skills": skill_analysis['matched_skills'],
-            "missing_skills": skill_analysis['missing_skills'],
-            "strengths": ai_analysis.get('strengths', ["Shows relevant background"]),
-            "recommendations": ai_analysis.get('recommendations', ["Continue skill development"]),
-            "experience_match": ai_analysis.get('experience_match', 'Average Match'),
-            "education_match": ai_analysis.get('education_match', 'Satisfactory'),
-            "key_achievements": ai_analysis.get('key_achievements', []),
-            "years_of_experience": ai_analysis.get('years_of_experience', 0),
-            "technical_skills_score": ai_analysis.get('technical_skills_score', 20),
-            "experience_score": ai_analysis.get('experience_score', 15),
-            "education_score": ai_analysis.get('education_score', 10),
-            "profile_quality_score": ai_analysis.get('profile_quality_score', 10)
-        }
+        # Only successful LLM analyses are cached; fallbacks retry next time
+        analysis_cache.set(cache_key, json.dumps(analysis))
+        LLM_CALLS.inc(call='resume', outcome='success')
+        return analysis
         
     except Exception as e:
         print(f"AI analysis failed: {e}")
+        LLM_CALLS.inc(call='resume', outcome='fallback')
         
-        # Enhanced fallback analysis
-        resume_lower = resume_text.lower()
-        
-        # Better experience estimation
-        years_mentioned = re.findall(r'(\d+)[\s\-]*(?:years?|yrs?)', resume_lower)
-        estimated_years = max([int(y) for y in years_mentioned]) if years_mentioned else 1
-        
-        # Better skill-based scoring
-        base_score = skill_analysis['total_score']
-        
-        # Experience bonus
-        if estimated_years >= 5:
-            base_score += 10
-        elif estimated_years >= 3:
-            base_score += 5
-        
-        # Education bonus
-        if any(edu in resume_lower for edu in ['bachelor', 'master', 'phd', 'degree']):
-            base_score += 8
-        
-        # Technical depth bonus
-        tech_keywords = ['project', 'developed', 'implemented', 'designed', 'built', 'created']
-        tech_count = sum(1 for word in tech_keywords if word in resume_lower)
-        base_score += min(tech_count * 2, 10)
-        
-        final_score = min(100, base_score)
-        
-        if final_score >= 75:
-            verdict = "Good Candidate - Proceed with Interview"
-        elif final_score >= 55:
-            verdict = "Potential Candidate - Review Carefully"
+        return score_resume_locally(resume_text, skill_analysis)
+
+# Prompt evaluating several resumes against one job; the job requirements
+# and scoring framework are sent once for the whole batch
+def build_batch_prompt(resume_texts, job_data):
+    candidates = "\n".join(
+        f"""
+    CANDIDATE {index} RESUME (first {TEXT_BUDGETS['prompt']} chars):
+    {resume_text[:TEXT_BUDGETS['prompt']]}
+    """
+        for index, resume_text in enumerate(resume_texts)
+    )
+    
+    return f"""
+    You are an expert HR professional evaluating {len(resume_texts)} resumes against the same job requirements.
+    Evaluate every candidate independently; do not compare or rank them against each other.
+    
+    JOB REQUIREMENTS:
+    - Position: {job_data.get('job_title', 'Not specified')}
+    - Must-have skills: {job_data.get('must_have_skills', [])}
+    - Nice-to-have skills: {job_data.get('good_to_have_skills', [])}
+    - Experience: {job_data.get('experience_required', 'Not specified')}
+    - Education: {job_data.get('education_required', 'Not specified')}
+    
+    ANALYSIS FRAMEWORK:
+    1. Technical Skills Match (0-40 points): How well do the candidate's technical skills align?
+    2. Experience Relevance (0-25 points): Does their experience match the requirements?
+    3. Educational Background (0-15 points): Does their education fit?
+    4. Overall Profile Quality (0-20 points): Resume quality, achievements, certifications, etc.
+    {candidates}
+    Return ONLY a valid JSON array with exactly {len(resume_texts)} objects, one per candidate, in candidate order:
+    [
+        {{
+            "candidate_index": candidate_number_as_labelled_above_starting_at_0,
+            "technical_skills_score": number_0_to_40,
+            "experience_score": number_0_to_25,
+            "education_score": number_0_to_15,
+            "profile_quality_score": number_0_to_20,
+            "experience_match": "Excellent Match" or "Good Match" or "Partial Match" or "Poor Match",
+            "education_match": "Excellent Match" or "Good Match" or "Partial Match" or "Poor Match",
+            "strengths": ["strength1", "strength2", "strength3"],
+            "recommendations": ["improvement1", "improvement2", "improvement3"],
+            "key_achievements": ["achievement1", "achievement2"],
+            "years_of_experience": estimated_years_number
+        }}
+    ]
+    """
+
+# Rough token count used for prompt budgeting (~4 characters per token)
+def estimate_tokens(text):
+    return len(text) // 4 + 1
+
+# Group resumes into batched prompts that respect the size and token budget
+def plan_prompt_batches(resume_texts, job_data, max_batch_size, token_budget):
+    """Return lists of indexes into resume_texts, one list per prompt"""
+    shared_tokens = estimate_tokens(build_batch_prompt([], job_data))
+    batches = []
+    current = []
+    used_tokens = shared_tokens
+    
+    for index, resume_text in enumerate(resume_texts):
+        # Truncated resume plus its candidate header and share of the JSON reply
+        cost = estimate_tokens(resume_text[:TEXT_BUDGETS['prompt']]) + 150
+        if current and (len(current) >= max_batch_size or used_tokens + cost > token_budget):
+            batches.append(current)
+            current = []
+            used_tokens = shared_tokens
+        current.append(index)
+        used_tokens += cost
+    
+    if current:
+        batches.append(current)
+    return batches
+
+# Analyze several resumes with one prompt, falling back to per-resume calls
+@timed('analyze_resumes_batch')
+def analyze_resumes_batch(resume_texts, job_data, model, skill_analyses, refresh=False):
+    analyses = [None] * len(resume_texts)
+    cache_keys = [analysis_cache_key(text, job_data) for text in resume_texts]
+    
+    pending = []
+    for index, cache_key in enumerate(cache_keys):
+        cached_analysis = None if refresh else analysis_cache.get(cache_key)
+        if cached_analysis is not None:
+            analyses[index] = json.loads(cached_analysis)
         else:
-            verdict = "Below Requirements - Consider for Future"
+            pending.append(index)
+    
+    if len(pending) < len(resume_texts):
+        LLM_CALLS.inc(len(resume_texts) - len(pending), call='resume', outcome='cached')
+    if not pending:
+        return analyses
+    
+    try:
+        with LLM_REQUEST_SECONDS.time(call='resume_batch'):
+            response = model.generate_content(build_batch_prompt([resume_texts[i] for i in pending], job_data))
+        items = parse_model_json(response.text)
+        if not isinstance(items, list) or len(items) != len(pending):
+            raise ValueError(f"expected a JSON array of {len(pending)} results")
         
-        return {
-            "overall_score": final_score,
-            "verdict": verdict,
-            "matched_skills": skill_analysis['matched_skills'],
-            "missing_skills": skill_analysis['missing_skills'],
-            "strengths": ["Technical background present", "Relevant experience indicated"],
-            "recommendations": ["Strengthen missing technical skills", "Highlight specific achievements"],
-            "experience_match": "Good Match" if estimated_years >= 2 else "Limited Experience",
-            "education_match": "Adequate" if any(edu in resume_lower for edu in ['bachelor', 'master', 'degree']) else "Basic",
-            "key_achievements": [],
-            "years_of_experience": estimated_years
-        }
+        if not all(isinstance(item, dict) for item in items):
+            raise ValueError("batch results must be JSON objects")
+        by_candidate = {}
+        for position, item in enumerate(items):
+            try:
+                by_candidate[int(item.get('candidate_index', position))] = item
+            except (TypeError, ValueError):
+                break
+        if set(by_candidate) != set(range(len(pending))):
+            # e.g. 1-based indexes; the array is requested in candidate order
+            by_candidate = dict(enumerate(items))
+        
+        for position, index in enumerate(pending):
+            analysis = build_ai_analysis(by_candidate[position], skill_analyses[index])
+            analysis_cache.set(cache_keys[index], json.dumps(analysis))
+            analyses[index] = analysis
+        LLM_CALLS.inc(call='resume_batch', outcome='success')
+    
+    except Exception as e:
+        print(f"Batched AI analysis failed ({e}), retrying {len(pending)} resumes one by one")
+        LLM_CALLS.inc(call='resume_batch', outcome='fallback')
+        for index in pending:
+            analyses[index] = analyze_resume(
+                resume_texts[index], job_data, model,
+                refresh=refresh,
+                skill_analysis=skill_analyses[index]
+            )
+    
+    return analyses
+
+# Pick which resumes get tier-2 (LLM) refinement based on their tier-1 scores
+def select_tier2(tier1_scores, eligible, band=None, top_n=0):
+    eligible = list(eligible)
+    if not band and not top_n:
+        return set(eligible)
+    
+    selected = set()
+    if band:
+        low, high = band
+        selected |= {i for i in eligible if low <= tier1_scores[i] <= high}
+    if top_n:
+        ranked = sorted(eligible, key=lambda i: tier1_scores[i], reverse=True)
+        selected |= set(ranked[:top_n])
+    return selected
+
+# Score resumes against the job with BM25, no network calls (0-100, best = 100)
+def prerank_resumes(resume_texts, job_text, job_data):
+    return normalize_scores(bm25_scores(resume_texts, prerank_query(job_text, job_data)))
+
+# BM25 query for a job: parsed skills are appended so they count even if the JD text words them differently
+def prerank_query(job_text, job_data):
+    return ' '.join([job_text] + [str(s) for s in job_data.get('must_have_skills', []) + job_data.get('good_to_have_skills', [])])
+
+# Extract and clean one resume; returns None when no usable text came out
+def extract_resume_text(uploaded_file):
+    return usable_resume_text(uploaded_file, extract_text_from_file(uploaded_file))
+
+# Extracted (already cleaned) resume text, or None if extraction failed or produced too little text
+def usable_resume_text(uploaded_file, resume_text):
+    if resume_text and not resume_text.startswith("Error") and len(resume_text.strip()) > 50:
+        print(f"Extracted {len(resume_text)} characters from {uploaded_file.name}")
+        return resume_text
+    
+    print(f"Failed to extract meaningful text from {uploaded_file.name}")
+    return None
+
+# Text of a previously analyzed resume from the text cache, or None if it was evicted or unusable
+def cached_resume_text(file_type, content_hash):
+    if not file_type or not content_hash:
+        return None
+    text = text_cache.get(text_cache_key(file_type, content_hash, EXTRACT_MAX_CHARS, EXTRACT_MAX_PAGES))
+    if text and not text.startswith("Error") and len(text.strip()) > 50:
+        return text
+    return None
+
+# Result entry for a successfully analyzed resume
+def build_result(uploaded_file, analysis):
+    return {
+        "candidate_name": uploaded_file.name.replace('.pdf', '').replace('.docx', ''),
+        "file_name": uploaded_file.name,
+        # Lets later runs find the resume text again (text cache, talent pool)
+        "content_hash": getattr(uploaded_file, 'content_hash', None),
+        "file_type": getattr(uploaded_file, 'type', None),
+        **analysis
+    }
+
+# Result entry for a resume whose text could not be extracted
+def build_error_result(uploaded_file, job_data):
+    return {
+        "candidate_name": uploaded_file.name,
+        "file_name": uploaded_file.name,
+        "content_hash": getattr(uploaded_file, 'content_hash', None),
+        "file_type": getattr(uploaded_file, 'type', None),
+        "overall_score": 0,
+        "verdict": "File Processing Error",
+        "matched_skills": [],
+        "missing_skills": job_data.get('must_have_skills', []),
+        "strengths": [],
+        "recommendations": ["File could not be processed - check file format"],
+        "experience_match": "Unknown",
+        "education_match": "Unknown"
+    }
 
 # Process multiple resumes
-def process_resumes(job_text, resume_files, model):
+@timed('process_resumes')
+def process_resumes(job_text, resume_files, model, config=None, progress_callback=None):
+    """Extract, skill-match and analyze a batch of resumes.
+
+    Returns (results sorted by score, job_data, batch skill statistics).
+    progress_callback(index, status, result=None) is called as each resume
+    starts ('in_flight') and again with its final result ('done' or 'failed').
+    """
+    config = {**PIPELINE_CONFIG, **(config or {})}
     print("Starting resume processing...")
     
     # Parse job description
-    job_data = parse_job_description(job_text, model)
+    job_data = parse_job_description(job_text, model, refresh=config['refresh'])
     print(f"Job parsed - Must have skills: {job_data.get('must_have_skills', [])}")
     
-    results = []
-    for i, uploaded_file in enumerate(resume_files):
-        print(f"Processing resume {i+1}/{len(resume_files)}: {uploaded_file.name}")
-        
-        # Extract resume text
-        resume_text = extract_text_from_file(uploaded_file)
-        resume_text = clean_text(resume_text)
+    run_stage = stage_runner(config['max_workers'], len(resume_files))
+    
+    # Stage 1: text extraction
+    def start(i, uploaded_file):
+        print(f"Processing resume {i+1}: {uploaded_file.name}")
+        if progress_callback:
+            progress_callback(i, 'in_flight')
+    
+    def check(i, uploaded_file, raw_text):
+        resume_text = usable_resume_text(uploaded_file, raw_text)
+        if resume_text is None and progress_callback:
+            progress_callback(i, 'failed', build_error_result(uploaded_file, job_data))
+        return resume_text
+    
+    if any(uploaded_file.type in ARCHIVE_TYPES for uploaded_file in resume_files):
+        # Archive members are parsed straight from memory, one chunk at a time,
+        # so an upload of hundreds of resumes is never unpacked to disk
+        chunk_size = max(config['max_workers'], config['extract_workers'], 1) * config['extract_chunksize']
+        run_chunk = stage_runner(config['max_workers'], chunk_size)
+        members = iter_upload_members(resume_files, config['archive_member_max_bytes'])
+        resume_files, resume_texts = [], []
+        while True:
+            chunk = [member for _, member in zip(range(chunk_size), members)]
+            if not chunk:
+                break
+            base = len(resume_files)
+            for offset, uploaded_file in enumerate(chunk):
+                start(base + offset, uploaded_file)
+            if config['extract_workers'] > 1:
+                raw_texts = extract_texts_parallel(chunk, config['extract_workers'], config['extract_chunksize'])
+            else:
+                raw_texts = run_chunk(extract_text_from_file, chunk)
+            for offset, (uploaded_file, raw_text) in enumerate(zip(chunk, raw_texts)):
+                resume_texts.append(check(base + offset, uploaded_file, raw_text))
+                if hasattr(uploaded_file, 'release'):
+                    uploaded_file.release()
+            resume_files.extend(chunk)
+    elif config['extract_workers'] > 1:
+        # Parse every file up front across CPU cores instead of interleaving
+        # GIL-bound parsing with LLM waits on the analysis threads
+        for i, uploaded_file in enumerate(resume_files):
+            start(i, uploaded_file)
+        raw_texts = extract_texts_parallel(resume_files, config['extract_workers'], config['extract_chunksize'])
+        resume_texts = [
+            check(i, uploaded_file, raw_text)
+            for i, (uploaded_file, raw_text) in enumerate(zip(resume_files, raw_texts))
+        ]
+    else:
+        def extract(indexed_file):
+            i, uploaded_file = indexed_file
+            start(i, uploaded_file)
+            return check(i, uploaded_file, extract_text_from_file(uploaded_file))
         
-        if resume_text and not resume_text.startswith("Error") and len(resume_text.strip()) > 50:
-            print(f"Extracted {len(resume_text)} characters from {uploaded_file.name}")
-            
-            # Analyze resume
-            analysis = analyze_resume(resume_text, job_data, model)
-            print(f"Score for {uploaded_file.name}: {analysis['overall_score']}")
-            
-            result = {
-                "candidate_name": uploaded_file.name.replace('.pdf', '').replace('.docx', ''),
-                "file_name": uploaded_file.name,
-                **analysis
-            }
-            results.append(result)
+        resume_texts = run_stage(extract, enumerate(resume_files))
+    
+    return rank_resume_texts(job_text, job_data, resume_files, resume_texts, model, config, progress_callback)
+
+# Uploaded files in order, with ZIP/tar.gz uploads replaced by their members
+def iter_upload_members(resume_files, max_member_bytes=None):
+    for uploaded_file in resume_files:
+        if uploaded_file.type not in ARCHIVE_TYPES:
+            yield uploaded_file
+            continue
+        for name, data in iter_archive_members(uploaded_file.path, max_member_bytes):
+            if data is None:
+                print(f"Skipping {name}: larger than {max_member_bytes} bytes")
+            # Oversized members come through empty and are reported as failed
+            yield MemoryFile(data or b'', posixpath.basename(name))
+
+# Bounded fan-out: at most max_workers extractions/LLM calls in flight.
+# executor.map keeps input order, so the stable sort in rank_resume_texts
+# gives the same ranking as the sequential path.
+def stage_runner(max_workers, total):
+    max_workers = max(1, min(max_workers, total))
+    
+    def run_stage(func, items):
+        if max_workers > 1:
+            # Workers are named after the calling thread so a job's profile can find them
+            prefix = f"{threading.current_thread().name}-stage"
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=prefix) as executor:
+                return list(executor.map(func, items))
+        return [func(item) for item in items]
+    return run_stage
+
+# Score already-extracted resume texts against a parsed job
+def rank_resume_texts(job_text, job_data, resume_files, resume_texts, model, config=None, progress_callback=None):
+    """Skill-match, pre-rank and analyze extracted texts (None = extraction failed).
+
+    resume_files only need a .name; results come back sorted by score along
+    with job_data and the batch skill statistics, as from process_resumes.
+    """
+    config = {**PIPELINE_CONFIG, **(config or {})}
+    must_have_skills = job_data.get('must_have_skills', [])
+    good_to_have_skills = job_data.get('good_to_have_skills', [])
+    run_stage = stage_runner(config['max_workers'], len(resume_files))
+    valid_indexes = [i for i, text in enumerate(resume_texts) if text is not None]
+    
+    # Stage 2: skill matching for the whole batch at once
+    skill_texts = [resume_texts[i][:TEXT_BUDGETS['skills']] for i in valid_indexes]
+    skill_analyses, skill_matrix = calculate_batch_skill_scores(
+        skill_texts, must_have_skills, good_to_have_skills
+    )
+    batch_stats = skill_batch_statistics(skill_matrix, must_have_skills, good_to_have_skills)
+    
+    # Stage 3: local pre-ranking decides which resumes are worth an LLM call
+    prerank_scores = prerank_resumes(skill_texts, job_text, job_data)
+    shortlisted = set(shortlist(
+        prerank_scores,
+        top_k=config['shortlist_size'],
+        min_score=config['shortlist_min_score']
+    ))
+    print(f"Pre-ranking shortlisted {len(shortlisted)}/{len(valid_indexes)} resumes for AI analysis")
+    
+    # Stage 4: tier-1 deterministic score for every resume
+    tier1_analyses = [
+        score_resume_locally(skill_texts[position], skill_analyses[position])
+        for position in range(len(valid_indexes))
+    ]
+    tier2 = select_tier2(
+        [analysis['overall_score'] for analysis in tier1_analyses],
+        shortlisted,
+        band=config['tier2_band'],
+        top_n=config['tier2_top_n']
+    )
+    print(f"Tier 2 (AI) refining {len(tier2)}/{len(valid_indexes)} resumes")
+    
+    # Stage 5: tier-2 LLM analysis for contenders, tier-1 result for the rest
+    finished = {}
+    
+    def finish(position, analysis):
+        i = valid_indexes[position]
+        analysis['prerank_score'] = round(float(prerank_scores[position]), 1)
+        analysis['shortlisted'] = position in shortlisted
+        result = build_result(resume_files[i], analysis)
+        print(f"Score for {resume_files[i].name}: {analysis['overall_score']}")
+        # Report each candidate as soon as it is scored so callers can stream it
+        if progress_callback:
+            progress_callback(i, 'done', result)
+        return i, result
+    
+    for position in range(len(valid_indexes)):
+        if position not in tier2:
+            i, result = finish(position, tier1_analyses[position])
+            finished[i] = result
+    
+    # Each unit is one LLM request: a single resume, or several packed into one prompt
+    tier2_positions = sorted(tier2)
+    if config['llm_batch_size'] > 1:
+        batches = plan_prompt_batches(
+            [resume_texts[valid_indexes[p]] for p in tier2_positions],
+            job_data,
+            max_batch_size=config['llm_batch_size'],
+            token_budget=config['llm_batch_token_budget']
+        )
+        units = [[tier2_positions[k] for k in batch] for batch in batches]
+    else:
+        units = [[p] for p in tier2_positions]
+    
+    def analyze(positions):
+        texts = [resume_texts[valid_indexes[p]] for p in positions]
+        unit_skill_analyses = [skill_analyses[p] for p in positions]
+        if len(positions) == 1:
+            unit_analyses = [analyze_resume(
+                texts[0], job_data, model,
+                refresh=config['refresh'],
+                skill_analysis=unit_skill_analyses[0]
+            )]
         else:
-            print(f"Failed to extract meaningful text from {uploaded_file.name}")
-            # Handle error case
-            results.append({
-                "candidate_name": uploaded_file.name,
-                "file_name": uploaded_file.name,
-                "overall_score": 0,
-                "verdict": "File Processing Error",
-                "matched_skills": [],
-                "missing_skills": job_data.get('must_have_skills', []),
-                "strengths": [],
-                "recommendations": ["File could not be processed - check file format"],
-                "experience_match": "Unknown",
-                "education_match": "Unknown"
-            })
+            unit_analyses = analyze_resumes_batch(
+                texts, job_data, model, unit_skill_analyses, refresh=config['refresh']
+            )
+        return [finish(p, analysis) for p, analysis in zip(positions, unit_analyses)]
+    
+    for unit_results in run_stage(analyze, units):
+        finished.update(unit_results)
+    
+    results = [
+        finished[i] if i in finished else build_error_result(uploaded_file, job_data)
+        for i, uploaded_file in enumerate(resume_files)
+    ]
     
     # Sort by score (highest first)
     results.sort(key=lambda x: x['overall_score'], reverse=True)
     print(f"Processing complete. Scores: {[r['overall_score'] for r in results]}")
     
-    return results, job_data
\ No newline at end of file
+    return results, job_data, batch_stats
+
+# job_data fields the LLM prompt uses besides the skill lists; changing any
+# other field never needs a new LLM call
+LLM_JOB_FIELDS = ('job_title', 'experience_required', 'education_required')
+
+# What changed between two parsed job descriptions
+def diff_job_data(previous_job_data, job_data):
+    def skill_set(data, key):
+        return {normalize_skill(s) for s in data.get(key, [])}
+    
+    changed_skills = set()
+    for key in ('must_have_skills', 'good_to_have_skills'):
+        changed_skills |= skill_set(previous_job_data, key) ^ skill_set(job_data, key)
+    
+    return {
+        'changed_fields': [
+            field for field in LLM_JOB_FIELDS
+            if job_data_fingerprint({field: previous_job_data.get(field)}) != job_data_fingerprint({field: job_data.get(field)})
+        ],
+        'changed_skills': sorted(changed_skills)
+    }
+
+# Re-score a previous run against a changed job description
+def reanalyze_results(job_text, job_data, previous_job_data, previous_results, resume_texts, model, config=None, progress_callback=None):
+    """Incrementally update previous results for a new job_data.
+
+    resume_texts[i] is the text behind previous_results[i] (None if it is no
+    longer available). Skill scores, pre-rank scores and tier-1 scores are
+    always recomputed locally. A tier-2 result only gets a new LLM call when
+    a prompt field changed or an added/removed skill appears in the resume;
+    otherwise its previous LLM scores are blended with the new skill score.
+    Each result is flagged in 'reanalysis' as 'reused', 'rescored', 'local'
+    or 'unavailable'. Returns (results sorted by score, job_data, batch
+    statistics, reanalysis summary).
+    """
+    config = {**PIPELINE_CONFIG, **(config or {})}
+    diff = diff_job_data(previous_job_data, job_data)
+    print(f"Incremental re-analysis - changed fields: {diff['changed_fields']}, changed skills: {diff['changed_skills']}")
+    
+    must_have_skills = job_data.get('must_have_skills', [])
+    good_to_have_skills = job_data.get('good_to_have_skills', [])
+    valid_indexes = [i for i, text in enumerate(resume_texts) if text is not None]
+    
+    skill_texts = [resume_texts[i][:TEXT_BUDGETS['skills']] for i in valid_indexes]
+    skill_analyses, skill_matrix = calculate_batch_skill_scores(skill_texts, must_have_skills, good_to_have_skills)
+    batch_stats = skill_batch_statistics(skill_matrix, must_have_skills, good_to_have_skills)
+    prerank_scores = prerank_resumes(skill_texts, job_text, job_data)
+    changed_skill_matcher = get_skill_matcher(diff['changed_skills'], []) if diff['changed_skills'] else None
+    
+    def needs_llm(position):
+        if diff['changed_fields']:
+            return True
+        return bool(changed_skill_matcher and changed_skill_matcher.matched_indexes(skill_texts[position]))
+    
+    updated = {}
+    
+    def finish(i, analysis, reanalysis):
+        previous = previous_results[i]
+        result = {
+            **analysis,
+            'candidate_name': previous['candidate_name'],
+            'file_name': previous['file_name'],
+            'content_hash': previous.get('content_hash'),
+            'file_type': previous.get('file_type'),
+            'reanalysis': reanalysis
+        }
+        if progress_callback:
+            progress_callback(i, 'done', result)
+        return i, result
+    
+    llm_positions = []
+    for position, i in enumerate(valid_indexes):
+        previous = previous_results[i]
+        skill_analysis = skill_analyses[position]
+        if previous.get('scoring_tier') == 2 and needs_llm(position):
+            llm_positions.append(position)
+            continue
+        if previous.get('scoring_tier') == 2:
+            # Previous LLM sub-scores, blended with the recomputed skill score
+            analysis, reanalysis = build_ai_analysis(previous, skill_analysis), 'reused'
+        else:
+            analysis, reanalysis = score_resume_locally(skill_texts[position], skill_analysis), 'local'
+        analysis['prerank_score'] = round(float(prerank_scores[position]), 1)
+        analysis['shortlisted'] = previous.get('shortlisted', True)
+        key, result = finish(i, analysis, reanalysis)
+        updated[key] = result
+    
+    def rescore(position):
+        i = valid_indexes[position]
+        analysis = analyze_resume(
+            resume_texts[i], job_data, model,
+            refresh=config['refresh'],
+            skill_analysis=skill_analyses[position]
+        )
+        analysis['prerank_score'] = round(float(prerank_scores[position]), 1)
+        analysis['shortlisted'] = previous_results[i].get('shortlisted', True)
+        return finish(i, analysis, 'rescored')
+    
+    run_stage = stage_runner(config['max_workers'], len(llm_positions))
+    updated.update(run_stage(rescore, llm_positions))
+    
+    results = []
+    for i, previous in enumerate(previous_results):
+        if i in updated:
+            results.append(updated[i])
+        else:
+            # Text is gone (or never extracted): keep the old result as-is
+            results.append({**previous, 'reanalysis': 'unavailable'})
+            if progress_callback:
+                progress_callback(i, 'failed', results[-1])
+    results.sort(key=lambda x: x['overall_score'], reverse=True)
+    
+    summary = {**diff}
+    for state in ('reused', 'rescored', 'local', 'unavailable'):
+        summary[state] = sum(1 for result in results if result['reanalysis'] == state)
+    print(f"Re-analysis complete: {summary['rescored']} rescored, {summary['reused']} reused, {summary['local']} local")
+    
+    return results, job_data, batch_stats, summary
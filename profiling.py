@@ -0,0 +1,183 @@
+"""Opt-in profiling of requests and the analysis jobs they queue.
+
+A profiled request runs under cProfile while a sampler thread records its
+stacks; an analysis job queued by that request is profiled the same way,
+with the job's stage worker threads sampled too. Each run writes
+<profile id>.<request|job>.pstats and a .collapsed file (one
+"frame;frame;frame count" line per stack, the input flamegraph tools take).
+"""
+import cProfile
+import os
+import random
+import sys
+import threading
+import uuid
+
+
+class ProfileSlot:
+    """A profile id's claim on the concurrency limit, shared by a request and its job"""
+    def __init__(self, profile_id, on_release):
+        self.profile_id = profile_id
+        self._refs = 1
+        self._lock = threading.Lock()
+        self._on_release = on_release
+
+    def retain(self):
+        with self._lock:
+            self._refs += 1
+
+    def release(self):
+        with self._lock:
+            self._refs -= 1
+            finished = self._refs == 0
+        if finished:
+            self._on_release()
+
+
+class StackSampler(threading.Thread):
+    """Counts the stacks of one thread and the stage workers it started.
+
+    Stage worker threads are named after the thread that created them
+    (see processor.stage_runner), which is how they are told apart from
+    other jobs' workers.
+    """
+    def __init__(self, root, label, interval):
+        super().__init__(name='profile-sampler', daemon=True)
+        self.root = root
+        self.label = label
+        self.interval = interval
+        self.counts = {}
+        self._stopped = threading.Event()
+
+    def run(self):
+        worker_prefix = self.root.name + '-'
+        while not self._stopped.wait(self.interval):
+            frames = sys._current_frames()
+            for thread in threading.enumerate():
+                if thread is self.root:
+                    role = self.label
+                elif thread.name.startswith(worker_prefix):
+                    role = 'workers'
+                else:
+                    continue
+                frame = frames.get(thread.ident)
+                if frame is not None:
+                    stack = self.label_stack(role, frame)
+                    self.counts[stack] = self.counts.get(stack, 0) + 1
+
+    @staticmethod
+    def label_stack(role, frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        names.append(role)
+        return ';'.join(reversed(names))
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+class ProfileRun:
+    """cProfile plus stack sampling of the current thread until stop()"""
+    def __init__(self, profiler, slot, label):
+        self.profiler = profiler
+        self.slot = slot
+        self.label = label
+        self._thread = threading.current_thread()
+        self._sampler = StackSampler(self._thread, label, profiler.interval)
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        try:
+            self._profile.enable()
+        except ValueError as e:
+            # Python 3.12+ allows one cProfile per process; stack samples still work
+            print(f"Profile {self.slot.profile_id}: cProfile unavailable ({e}), sampling stacks only")
+            self._profile = None
+        self._sampler.start()
+        return self
+
+    def stop(self):
+        if self._profile is not None:
+            self._profile.disable()
+        self._sampler.stop()
+        self.profiler.save(self.slot.profile_id, self.label, self._profile, self._sampler.counts)
+
+
+class Profiler:
+    def __init__(self, directory, sample_rate=0.0, max_concurrent=1, interval=0.005, keep=50, token=''):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.keep = keep
+        self.token = token
+        self._slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent > 0 else None
+
+    def wanted(self, header_value, sampled_request=True):
+        """Whether a request asked to be profiled (header) or was picked by sampling.
+
+        The header only counts when a token is configured and it matches, so
+        anonymous clients can't take the profile slots sampling relies on.
+        """
+        if header_value and self.token and header_value == self.token:
+            return True
+        return sampled_request and self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def acquire(self):
+        """A new ProfileSlot, or None when PROFILE_MAX_CONCURRENT profiles are already running"""
+        if self._slots is None or not self._slots.acquire(blocking=False):
+            return None
+        return ProfileSlot(uuid.uuid4().hex, self._slots.release)
+
+    def start(self, slot, label):
+        return ProfileRun(self, slot, label).start()
+
+    def wrap(self, func, slot, label='job'):
+        """func run under a profile sharing slot, e.g. on a background job thread"""
+        slot.retain()
+
+        def profiled(*args, **kwargs):
+            run = self.start(slot, label)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                run.stop()
+                slot.release()
+        return profiled
+
+    def save(self, profile_id, label, profile, stack_counts):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            base = os.path.join(self.directory, f"{profile_id}.{label}")
+            if profile is not None:
+                profile.dump_stats(base + '.pstats')
+            with open(base + '.collapsed', 'w', encoding='utf-8') as f:
+                for stack, count in sorted(stack_counts.items()):
+                    f.write(f"{stack} {count}\n")
+            print(f"Saved {label} profile {profile_id} to {self.directory}")
+            self.prune()
+        except Exception as e:
+            print(f"Error saving profile {profile_id}: {e}")
+
+    def prune(self):
+        """Keep the artifacts of the newest `keep` profile ids"""
+        newest = {}
+        for name in os.listdir(self.directory):
+            if name.endswith(('.pstats', '.collapsed')):
+                profile_id = name.split('.', 1)[0]
+                try:
+                    mtime = os.path.getmtime(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue
+                newest[profile_id] = max(mtime, newest.get(profile_id, 0))
+        expired = sorted(newest, key=newest.get, reverse=True)[self.keep:]
+        for name in os.listdir(self.directory):
+            if name.split('.', 1)[0] in expired:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    # A request and its job can prune at the same time
+                    pass
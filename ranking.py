@@ -0,0 +1,70 @@
+import re
+from collections import Counter
+
+# Keeps tokens like "c++", "c#" and "node.js" intact
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'our', 'that', 'the', 'their', 'this', 'to', 'we', 'will', 'with', 'you',
+    'your', 'who', 'work', 'working', 'experience', 'years', 'year', 'team', 'strong', 'ability', 'etc'
+}
+
+
+def tokenize(text):
+    """Lowercase word tokens without stopwords or trailing punctuation"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        token = token.rstrip('.')
+        if token and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+def bm25_scores(documents, query, k1=1.5, b=0.75):
+    """BM25 relevance of each document to the query, from local statistics only"""
+    import numpy as np
+
+    if not documents:
+        return np.zeros(0)
+
+    doc_counts = [Counter(tokenize(document)) for document in documents]
+    terms = sorted(set(tokenize(query)))
+    if not terms:
+        return np.zeros(len(documents))
+
+    lengths = np.array([sum(counts.values()) for counts in doc_counts], dtype=float)
+    avg_length = lengths.mean() or 1.0
+
+    # documents x query terms
+    tf = np.array([[counts[term] for term in terms] for counts in doc_counts], dtype=float)
+    df = (tf > 0).sum(axis=0)
+    idf = np.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+
+    norm = k1 * (1 - b + b * lengths[:, None] / avg_length)
+    return (idf * tf * (k1 + 1) / (tf + norm)).sum(axis=1)
+
+
+def normalize_scores(scores):
+    """Scale scores to 0-100 relative to the best one"""
+    import numpy as np
+
+    if len(scores) == 0 or scores.max() <= 0:
+        return np.zeros(len(scores))
+    return scores / scores.max() * 100
+
+
+def shortlist(scores, top_k=None, min_score=None):
+    """Indexes that pass the pre-ranking cut, best first.
+
+    top_k keeps the K best documents and min_score (0-100 scale) drops
+    weak matches; when both are set a document must pass both.
+    """
+    import numpy as np
+
+    order = [int(i) for i in np.argsort(-scores, kind='stable')]
+    if min_score:
+        order = [i for i in order if scores[i] >= min_score]
+    if top_k:
+        order = order[:top_k]
+    return order
@@ -0,0 +1,126 @@
+import re
+from functools import lru_cache
+
+# Interchangeable spellings of common skills (lowercase). Any member of a
+# group matches a job skill written as any other member of the same group.
+SKILL_SYNONYMS = [
+    ['javascript', 'js', 'ecmascript'],
+    ['typescript'],
+    ['node.js', 'nodejs', 'node js'],
+    ['react', 'react.js', 'reactjs'],
+    ['vue', 'vue.js', 'vuejs'],
+    ['angular', 'angularjs', 'angular.js'],
+    ['next.js', 'nextjs'],
+    ['postgresql', 'postgres'],
+    ['mongodb', 'mongo'],
+    ['kubernetes', 'k8s'],
+    ['aws', 'amazon web services'],
+    ['gcp', 'google cloud', 'google cloud platform'],
+    ['azure', 'microsoft azure'],
+    ['c#', 'csharp', 'c sharp'],
+    ['c++', 'cpp'],
+    ['golang', 'go'],
+    ['.net', 'dotnet'],
+    ['machine learning', 'ml'],
+    ['artificial intelligence', 'ai'],
+    ['natural language processing', 'nlp'],
+    ['ci/cd', 'ci cd', 'continuous integration'],
+    ['rest api', 'restful api', 'rest apis', 'restful apis'],
+    ['scikit-learn', 'sklearn'],
+    ['tensorflow', 'tf'],
+]
+
+# Skills detected in every resume when it is added to the talent pool,
+# independent of any job description
+COMMON_SKILLS = [group[0] for group in SKILL_SYNONYMS] + [
+    'python', 'java', 'sql', 'html', 'css', 'php', 'ruby', 'rust', 'scala', 'kotlin', 'swift',
+    'r', 'docker', 'terraform', 'linux', 'git', 'django', 'flask', 'fastapi', 'spring',
+    'mysql', 'redis', 'kafka', 'spark', 'hadoop', 'pandas', 'numpy', 'pytorch', 'tableau',
+    'excel', 'graphql', 'microservices', 'agile', 'scrum', 'deep learning', 'data analysis'
+]
+
+# Short aliases that are also ordinary words or abbreviations in resume text
+# ("go to market", "5 ml"). They only count when the job itself lists the
+# skill that way, never as a synonym for the long form.
+AMBIGUOUS_ALIASES = {'js', 'go', 'ml', 'ai', 'tf'}
+
+_SYNONYM_LOOKUP = {term: group for group in SKILL_SYNONYMS for term in group}
+
+
+def normalize_skill(skill):
+    """Lowercase a skill and collapse internal whitespace"""
+    return ' '.join(str(skill).lower().split())
+
+
+def skill_variants(skill):
+    """All spellings that count as a match for a skill"""
+    normalized = normalize_skill(skill)
+    synonyms = {v for v in _SYNONYM_LOOKUP.get(normalized, []) if v not in AMBIGUOUS_ALIASES}
+    return synonyms | {normalized}
+
+
+class SkillMatcher:
+    """Matches a job's skills against resume text in a single regex pass.
+
+    Skills only match as whole tokens, so "Java" no longer matches inside
+    "JavaScript" and "R" only matches the standalone letter.
+    """
+    def __init__(self, must_have_skills, good_to_have_skills):
+        self.must_have_skills = list(must_have_skills)
+        self.good_to_have_skills = list(good_to_have_skills)
+        self.skills = self.must_have_skills + self.good_to_have_skills
+
+        # variant -> indexes into self.skills
+        self._variant_skills = {}
+        for index, skill in enumerate(self.skills):
+            for variant in skill_variants(skill):
+                if variant:
+                    self._variant_skills.setdefault(variant, set()).add(index)
+
+        if self._variant_skills:
+            # Longest first so "machine learning" wins over shorter overlapping variants
+            alternatives = sorted(self._variant_skills, key=len, reverse=True)
+            body = '|'.join(self._variant_pattern(v) for v in alternatives)
+            self._pattern = re.compile(rf'(?:{body})(?![a-z0-9+#])')
+        else:
+            self._pattern = None
+
+    @staticmethod
+    def _variant_pattern(variant):
+        pattern = r'\s+'.join(re.escape(part) for part in variant.split(' '))
+        # Only a variant starting with a word character needs a word boundary
+        # before it, so ".net" still matches inside "asp.net" and "vb.net"
+        if variant[0].isalnum():
+            pattern = r'(?<![a-z0-9])' + pattern
+        return pattern
+
+    def matched_indexes(self, text):
+        """Indexes into self.skills (must-have first) found in the text"""
+        found = set()
+        if self._pattern is None:
+            return found
+        for match in self._pattern.finditer(text.lower()):
+            found |= self._variant_skills[' '.join(match.group().split())]
+        return found
+
+    def match(self, text):
+        """Return (matched_must_have, matched_good_to_have, missing_must_have) in job order"""
+        found = self.matched_indexes(text)
+        must_count = len(self.must_have_skills)
+        matched_must_have = [s for i, s in enumerate(self.must_have_skills) if i in found]
+        matched_good_to_have = [s for i, s in enumerate(self.good_to_have_skills) if i + must_count in found]
+        missing_must_have = [s for i, s in enumerate(self.must_have_skills) if i not in found]
+        return matched_must_have, matched_good_to_have, missing_must_have
+
+
+@lru_cache(maxsize=64)
+def _cached_matcher(must_have_skills, good_to_have_skills):
+    return SkillMatcher(must_have_skills, good_to_have_skills)
+
+
+def get_skill_matcher(must_have_skills, good_to_have_skills):
+    """Return a compiled matcher, built once per distinct job skill set"""
+    return _cached_matcher(
+        tuple(str(s) for s in must_have_skills),
+        tuple(str(s) for s in good_to_have_skills)
+    )
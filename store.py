@@ -0,0 +1,154 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# Runs older than this are deleted when new runs are saved
+RUN_RETENTION_SECONDS = 7 * 24 * 3600
+
+
+class ResultStore:
+    """Server-side storage for analysis runs; the session only keeps the run id"""
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                job_data TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                stats TEXT
+            )
+        """)
+        # Stores created before batch statistics were kept
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(runs)")}
+        if 'stats' not in columns:
+            self._conn.execute("ALTER TABLE runs ADD COLUMN stats TEXT")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                run_id TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                candidate_name TEXT NOT NULL,
+                overall_score INTEGER NOT NULL,
+                verdict TEXT NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (run_id, rank)
+            )
+        """)
+        self._conn.commit()
+
+    def create_run(self, results, job_data, stats=None):
+        """Save score-sorted results (and optional batch statistics) and return the new run id"""
+        run_id = uuid.uuid4().hex
+        with self._lock:
+            self._prune()
+            self._conn.execute(
+                "INSERT INTO runs (run_id, job_data, total, created_at, stats) VALUES (?, ?, ?, ?, ?)",
+                (run_id, json.dumps(job_data), len(results), time.time(), json.dumps(stats or {}))
+            )
+            self._conn.executemany(
+                "INSERT INTO results (run_id, rank, candidate_name, overall_score, verdict, data) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, rank, result['candidate_name'], result['overall_score'], result['verdict'], json.dumps(result))
+                    for rank, result in enumerate(results)
+                ]
+            )
+            self._conn.commit()
+        return run_id
+
+    def get_run(self, run_id):
+        """Return run metadata (job_data, total, created_at, stats) or None"""
+        if not run_id:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_data, total, created_at, stats FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'run_id': run_id,
+            'job_data': json.loads(row[0]),
+            'total': row[1],
+            'created_at': row[2],
+            'stats': json.loads(row[3]) if row[3] else {}
+        }
+
+    def get_result(self, run_id, rank):
+        """Return the full result at a rank (0 = best score) or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM results WHERE run_id = ? AND rank = ?", (run_id, rank)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_candidates(self, run_id, offset=0, limit=50):
+        """Return a page of lightweight candidate rows in rank order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rank, candidate_name, overall_score, verdict FROM results "
+                "WHERE run_id = ? ORDER BY rank LIMIT ? OFFSET ?",
+                (run_id, limit, offset)
+            ).fetchall()
+        return [
+            {'rank': rank, 'candidate_name': name, 'overall_score': score, 'verdict': verdict}
+            for rank, name, score, verdict in rows
+        ]
+
+    def iter_results(self, run_id, batch_size=500):
+        """Yield full results in rank order without loading the whole run"""
+        offset = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT data FROM results WHERE run_id = ? ORDER BY rank LIMIT ? OFFSET ?",
+                    (run_id, batch_size, offset)
+                ).fetchall()
+            if not rows:
+                return
+            for (data,) in rows:
+                yield json.loads(data)
+            offset += len(rows)
+
+    def score_summary(self, run_id):
+        """Aggregate score statistics for a run"""
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT COUNT(*), AVG(overall_score), MAX(overall_score), MIN(overall_score),
+                       SUM(CASE WHEN overall_score >= 75 THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN overall_score >= 50 AND overall_score < 75 THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN overall_score < 50 THEN 1 ELSE 0 END)
+                FROM results WHERE run_id = ?
+            """, (run_id,)).fetchone()
+        return {
+            'total_candidates': row[0],
+            'avg_score': row[1] or 0,
+            'max_score': row[2] or 0,
+            'min_score': row[3] or 0,
+            'excellent_count': row[4] or 0,
+            'good_count': row[5] or 0,
+            'poor_count': row[6] or 0
+        }
+
+    def delete_run(self, run_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM results WHERE run_id = ?", (run_id,))
+            self._conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+            self._conn.commit()
+
+    def _prune(self):
+        cutoff = time.time() - RUN_RETENTION_SECONDS
+        self._conn.execute(
+            "DELETE FROM results WHERE run_id IN (SELECT run_id FROM runs WHERE created_at < ?)", (cutoff,)
+        )
+        self._conn.execute("DELETE FROM runs WHERE created_at < ?", (cutoff,))
@@ -0,0 +1,185 @@
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from ranking import tokenize
+from skills import COMMON_SKILLS, get_skill_matcher
+
+
+class TalentPool:
+    """Persistent index of previously uploaded candidates.
+
+    Keeps each resume's cleaned text and detected skills keyed by content
+    hash, plus an inverted term index so a new job description can be
+    BM25-matched against every stored candidate without re-parsing files.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS candidates (
+                content_hash TEXT PRIMARY KEY,
+                file_name TEXT NOT NULL,
+                text TEXT NOT NULL,
+                skills TEXT NOT NULL,
+                length INTEGER NOT NULL,
+                added_at REAL NOT NULL,
+                last_seen REAL NOT NULL
+            )
+        """)
+        # Inverted index: term -> candidates containing it, with term frequency
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, content_hash)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS postings_candidate ON postings (content_hash)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS candidates_last_seen ON candidates (last_seen)")
+        self._conn.commit()
+
+    def contains(self, content_hash):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM candidates WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+        return row is not None
+
+    def add(self, content_hash, file_name, text):
+        """Index a candidate; re-adding the same content only refreshes last_seen"""
+        now = time.time()
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE candidates SET last_seen = ?, file_name = ? WHERE content_hash = ?",
+                (now, file_name, content_hash)
+            ).rowcount
+            if updated:
+                self._conn.commit()
+                return False
+
+        term_counts = Counter(tokenize(text))
+        matched, _, _ = get_skill_matcher(COMMON_SKILLS, []).match(text)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO candidates (content_hash, file_name, text, skills, length, added_at, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (content_hash, file_name, text, json.dumps(matched), sum(term_counts.values()), now, now)
+            )
+            self._conn.execute("DELETE FROM postings WHERE content_hash = ?", (content_hash,))
+            self._conn.executemany(
+                "INSERT INTO postings (term, content_hash, tf) VALUES (?, ?, ?)",
+                [(term, content_hash, tf) for term, tf in term_counts.items()]
+            )
+            self._conn.commit()
+        return True
+
+    def search(self, query, top_k=50, k1=1.5, b=0.75):
+        """BM25 match of query against the pool.
+
+        Returns [(content_hash, score)] best first, only for candidates that
+        share at least one term with the query. Same formula as
+        ranking.bm25_scores, but driven by the inverted index.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+
+        placeholders = ','.join('?' * len(terms))
+        with self._lock:
+            total, avg_length = self._conn.execute(
+                "SELECT COUNT(*), AVG(length) FROM candidates"
+            ).fetchone()
+            if not total:
+                return []
+            document_frequency = dict(self._conn.execute(
+                f"SELECT term, COUNT(*) FROM postings WHERE term IN ({placeholders}) GROUP BY term", terms
+            ).fetchall())
+            rows = self._conn.execute(
+                f"SELECT p.content_hash, p.term, p.tf, c.length FROM postings p "
+                f"JOIN candidates c ON c.content_hash = p.content_hash WHERE p.term IN ({placeholders})",
+                terms
+            ).fetchall()
+
+        avg_length = avg_length or 1.0
+        idf = {
+            term: math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+        scores = {}
+        for content_hash, term, tf, length in rows:
+            norm = k1 * (1 - b + b * length / avg_length)
+            scores[content_hash] = scores.get(content_hash, 0.0) + idf[term] * tf * (k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:top_k] if top_k else ranked
+
+    def get_candidates(self, content_hashes):
+        """Return {content_hash: {'file_name', 'text', 'skills'}} for the given hashes"""
+        found = {}
+        hashes = list(content_hashes)
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT content_hash, file_name, text, skills FROM candidates "
+                    f"WHERE content_hash IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+            for content_hash, file_name, text, skills in rows:
+                found[content_hash] = {'file_name': file_name, 'text': text, 'skills': json.loads(skills)}
+        return found
+
+    def stats(self):
+        """Candidate and indexed term counts"""
+        with self._lock:
+            candidates = self._conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+            terms = self._conn.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()[0]
+        return {'candidates': candidates, 'terms': terms}
+
+    def remove(self, content_hashes):
+        """Forget the given candidates; returns how many were stored"""
+        hashes = [h for h in content_hashes if h]
+        removed = 0
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            with self._lock:
+                self._conn.execute(f"DELETE FROM postings WHERE content_hash IN ({placeholders})", chunk)
+                removed += self._conn.execute(
+                    f"DELETE FROM candidates WHERE content_hash IN ({placeholders})", chunk
+                ).rowcount
+                self._conn.commit()
+        return removed
+
+    def purge(self, max_age_seconds=None):
+        """Remove candidates not seen for max_age_seconds, or everyone when None"""
+        cutoff = time.time() - max_age_seconds if max_age_seconds is not None else float('inf')
+        with self._lock:
+            expired = [row[0] for row in self._conn.execute(
+                "SELECT content_hash FROM candidates WHERE last_seen < ?", (cutoff,)
+            ).fetchall()]
+        return self.remove(expired)
+
+
+class PoolResume:
+    """Stands in for an uploaded file when a candidate's text comes from the pool"""
+    def __init__(self, name, content_hash):
+        self.name = name
+        self.content_hash = content_hash
+
+    def close(self):
+        pass
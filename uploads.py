@@ -0,0 +1,330 @@
+import hashlib
+import io
+import mmap
+import os
+import posixpath
+import tarfile
+import tempfile
+import zipfile
+
+# Bytes copied per read while streaming an upload
+CHUNK_SIZE = 64 * 1024
+
+# Uploads below this size stay in memory when spooled
+SPOOL_MAX_MEMORY = 1024 * 1024
+
+
+DOCX_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+# Leading bytes of the formats we accept; PDF may have junk before its header
+MAGIC_TYPES = [
+    (b'PK\x03\x04', 'application/zip'),
+    (b'\x1f\x8b', 'application/gzip'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'application/msword'),
+]
+SNIFF_BYTES = 1024
+
+# Uploads that are expanded into their members instead of parsed
+ARCHIVE_TYPES = ('application/zip', 'application/gzip')
+
+
+class UploadTooLarge(ValueError):
+    """Raised when an upload exceeds its size limit while being written"""
+
+
+def guess_file_type(filename):
+    """MIME type for a document based on its extension"""
+    name = filename.lower()
+    if name.endswith('.pdf'):
+        return 'application/pdf'
+    if name.endswith('.docx'):
+        return DOCX_TYPE
+    if name.endswith('.doc'):
+        return 'application/msword'
+    if name.endswith('.zip'):
+        return 'application/zip'
+    if name.endswith(('.tar.gz', '.tgz')):
+        return 'application/gzip'
+    return 'application/octet-stream'
+
+
+def sniff_file_type(header):
+    """MIME type from a file's leading bytes, or None if unrecognized"""
+    # Exact prefixes first: a ZIP storing an uncompressed PDF also contains %PDF-
+    for magic, file_type in MAGIC_TYPES:
+        if header.startswith(magic):
+            return file_type
+    if b'%PDF-' in header[:SNIFF_BYTES]:
+        return 'application/pdf'
+    return None
+
+
+def detect_file_type(stream, filename=''):
+    """MIME type from a seekable stream's content, falling back to the extension"""
+    position = stream.tell()
+    try:
+        file_type = sniff_file_type(stream.read(SNIFF_BYTES))
+        if file_type == 'application/zip':
+            # DOCX is a ZIP container; the Word part tells them apart
+            stream.seek(position)
+            try:
+                with zipfile.ZipFile(stream) as container:
+                    if 'word/document.xml' in container.namelist():
+                        file_type = DOCX_TYPE
+            except zipfile.BadZipFile:
+                pass
+    finally:
+        stream.seek(position)
+    return file_type or guess_file_type(filename)
+
+
+def _skip_member(name):
+    # Folders, hidden files and macOS resource forks are never resumes
+    base = posixpath.basename(name)
+    return not base or base.startswith('.') or name.startswith('__MACOSX/')
+
+
+def list_archive_members(path):
+    """Names of the files iter_archive_members will yield, in the same order"""
+    return [name for name, _ in _iter_archive(path, read=False)]
+
+
+def iter_archive_members(path, max_member_bytes=None):
+    """Yield (member name, bytes) for each file in a ZIP or tar.gz archive.
+
+    Members are decompressed one at a time straight from the archive, so
+    nothing is unpacked to disk. bytes is None for a member larger than
+    max_member_bytes.
+    """
+    return _iter_archive(path, read=True, max_member_bytes=max_member_bytes)
+
+
+def _iter_archive(path, read, max_member_bytes=None):
+    with open(path, 'rb') as f:
+        archive_type = sniff_file_type(f.read(SNIFF_BYTES))
+
+    def limited(member, declared_size):
+        if max_member_bytes and declared_size > max_member_bytes:
+            return None
+        # Declared sizes can lie, so never read past the limit
+        data = member.read(max_member_bytes + 1 if max_member_bytes else -1)
+        return None if max_member_bytes and len(data) > max_member_bytes else data
+
+    if archive_type == 'application/zip':
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or _skip_member(info.filename):
+                    continue
+                if not read:
+                    yield info.filename, None
+                    continue
+                with archive.open(info) as member:
+                    yield info.filename, limited(member, info.file_size)
+    elif archive_type == 'application/gzip':
+        # Stream mode: one forward pass over the compressed data
+        with tarfile.open(path, mode='r|gz') as archive:
+            for info in archive:
+                if not info.isfile() or _skip_member(info.name):
+                    continue
+                if not read:
+                    yield info.name, None
+                    continue
+                yield info.name, limited(archive.extractfile(info), info.size)
+    else:
+        raise ValueError("Unsupported archive format (expected ZIP or tar.gz)")
+
+
+def _copy_hashed(source, target, max_bytes, name):
+    """Copy source to target in chunks, returning (sha256 hex, size)"""
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = source.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if max_bytes and size > max_bytes:
+            raise UploadTooLarge(f"{name} exceeds the {max_bytes // (1024 * 1024)}MB upload limit")
+        digest.update(chunk)
+        target.write(chunk)
+    return digest.hexdigest(), size
+
+
+def save_upload(file_storage, directory, max_bytes=None, prefix=''):
+    """Stream an uploaded file to disk, hashing it as it is written.
+
+    Returns (path, sha256 hex digest, size in bytes). Nothing is left on disk
+    if the upload goes over max_bytes.
+    """
+    suffix = os.path.splitext(file_storage.filename or '')[1].lower()
+    target = tempfile.NamedTemporaryFile(dir=directory, prefix=prefix, suffix=suffix, delete=False)
+    try:
+        with target:
+            content_hash, size = _copy_hashed(file_storage.stream, target, max_bytes, file_storage.filename)
+    except Exception:
+        os.remove(target.name)
+        raise
+    return target.name, content_hash, size
+
+
+def spool_upload(file_storage, max_bytes=None):
+    """Stream an upload into a SpooledTemporaryFile, hashing it as it is written.
+
+    Small files stay in memory; larger ones roll over to a temporary file.
+    Returns (spooled file positioned at 0, sha256 hex digest, size in bytes).
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    try:
+        content_hash, size = _copy_hashed(file_storage.stream, spooled, max_bytes, file_storage.filename)
+    except Exception:
+        spooled.close()
+        raise
+    spooled.seek(0)
+    return spooled, content_hash, size
+
+
+class SpooledFileWrapper:
+    """Uploaded-file interface over a spooled upload, read in place"""
+    def __init__(self, spooled, original_name, content_hash=None):
+        self.name = original_name
+        self.type = guess_file_type(original_name)
+        self.content_hash = content_hash
+        self._spooled = spooled
+
+    def read(self, size=-1):
+        return self._spooled.read(size)
+
+    def seek(self, offset, whence=0):
+        return self._spooled.seek(offset, whence)
+
+    def tell(self):
+        return self._spooled.tell()
+
+    def seekable(self):
+        return True
+
+    def close(self):
+        self._spooled.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class StreamlitFileWrapper:
+    """Wrapper to mimic Streamlit's UploadedFile interface over a file on disk"""
+    def __init__(self, file_path, original_name, content_hash=None):
+        self.name = original_name
+        self.path = file_path
+        self.content_hash = content_hash  # SHA-256 computed while the upload was written
+        self._file_handle = None
+
+        # Type comes from the file's magic bytes; the extension is only a fallback
+        try:
+            self.type = detect_file_type(self._open(), original_name)
+        except OSError:
+            self.type = guess_file_type(original_name)
+
+    def _open(self):
+        # Memory-mapped, so extractors read the file in place instead of copying it
+        if self._file_handle is None:
+            self._file_handle = open_mapped(self.path)
+        return self._file_handle
+
+    def read(self, size=-1):
+        return self._open().read(size)
+
+    def seek(self, offset, whence=0):
+        return self._open().seek(offset, whence)
+
+    def tell(self):
+        return self._open().tell()
+
+    def seekable(self):
+        return True
+
+    def close(self):
+        if self._file_handle:
+            self._file_handle.close()
+            self._file_handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class MemoryFile:
+    """Uploaded-file interface over bytes in memory, e.g. one archive member"""
+    def __init__(self, data, name):
+        self.name = name
+        self.content_hash = hashlib.sha256(data).hexdigest()
+        self._buffer = io.BytesIO(data)
+        self.type = detect_file_type(self._buffer, name)
+
+    def read(self, size=-1):
+        return self._buffer.read(size)
+
+    def seek(self, offset, whence=0):
+        return self._buffer.seek(offset, whence)
+
+    def tell(self):
+        return self._buffer.tell()
+
+    def seekable(self):
+        return True
+
+    def release(self):
+        """Drop the bytes once the text is extracted; name, type and hash stay"""
+        self._buffer = io.BytesIO()
+
+    def close(self):
+        self.release()
+
+
+class MappedFile(io.RawIOBase):
+    """Seekable read-only file object over a memory map, so parsers read pages in place"""
+    def __init__(self, mapped):
+        super().__init__()
+        self._map = mapped
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def read(self, size=-1):
+        return self._map.read(None if size is None or size < 0 else size)
+
+    def readinto(self, buffer):
+        data = self._map.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=0):
+        self._map.seek(offset, whence)
+        return self._map.tell()
+
+    def tell(self):
+        return self._map.tell()
+
+    def close(self):
+        if not self.closed:
+            self._map.close()
+        super().close()
+
+
+def open_mapped(path):
+    """Read-only memory-mapped file object (a plain file handle for empty files)"""
+    handle = open(path, 'rb')
+    if os.fstat(handle.fileno()).st_size == 0:
+        return handle
+    try:
+        return MappedFile(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+    finally:
+        # The map keeps its own reference to the file
+        handle.close()